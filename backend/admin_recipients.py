@@ -0,0 +1,55 @@
+import asyncio
+import logging
+import os
+import time
+from typing import List, Optional
+
+from database import get_database
+
+logger = logging.getLogger(__name__)
+
+ADMIN_RECIPIENTS_TTL = float(os.environ.get("ADMIN_RECIPIENTS_TTL", "300"))  # seconds
+
+
+class AdminRecipientRegistry:
+    """Cached admin email addresses and their notification preferences.
+
+    Loaded once, then reloaded after `ttl` seconds or when `invalidate` is
+    called (role or preference change), so notification paths do not query
+    the users collection.
+    """
+
+    def __init__(self, ttl: float = ADMIN_RECIPIENTS_TTL):
+        self.ttl = ttl
+        self._admins: List[dict] = []
+        self._expires_at = 0.0
+        self._lock: Optional[asyncio.Lock] = None
+
+    async def refresh(self):
+        db = await get_database()
+        self._admins = await db.users.find(
+            {"role": "admin", "is_active": {"$ne": False}},
+            {"_id": 0, "email": 1, "notification_preferences": 1}
+        ).to_list(length=None)
+        self._expires_at = time.monotonic() + self.ttl
+
+    def invalidate(self):
+        self._expires_at = 0.0
+
+    async def recipients(self, kind: str) -> List[str]:
+        """Emails of the admins subscribed to `kind` (e.g. "appointment_notification")."""
+        if time.monotonic() >= self._expires_at:
+            if self._lock is None:
+                self._lock = asyncio.Lock()
+            async with self._lock:
+                if time.monotonic() >= self._expires_at:
+                    await self.refresh()
+        return [
+            admin["email"]
+            for admin in self._admins
+            if (admin.get("notification_preferences") or {}).get(kind, True)
+        ]
+
+
+# Global admin recipient registry
+admin_recipients = AdminRecipientRegistry()
@@ -0,0 +1,241 @@
+"""Incremental daily rollups for the admin statistics.
+
+Fields of a day document:
+- bookings, status.<status>, revenue: appointments booked that day (by created_at),
+  counted under their current status; revenue sums confirmed/completed prices.
+  Archived appointments (retention) still count; deleted appointments do not.
+- ratings.count, ratings.sum: approved reviews written that day
+- slots.total, slots.booked: time slots scheduled that day (by slot date)
+
+The write paths apply `$inc` deltas, so reading a period costs one document per day.
+"""
+import logging
+from collections import Counter as TallyCounter
+from datetime import date, datetime, timedelta
+from typing import Iterable, Optional
+
+from pymongo import DeleteOne, ReplaceOne, UpdateOne
+from pymongo.errors import PyMongoError
+
+logger = logging.getLogger(__name__)
+
+# Un document par jour, _id = "YYYY-MM-DD"
+ROLLUP_COLLECTION = "analytics_daily"
+
+# Statuts dont le prix compte dans le chiffre d'affaires
+REVENUE_STATUSES = {"confirmed", "completed"}
+
+
+def day_key(value) -> Optional[str]:
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value.replace('Z', '+00:00'))
+        except ValueError:
+            return None
+    if isinstance(value, (datetime, date)):
+        return value.strftime("%Y-%m-%d")
+    return None
+
+
+async def _increment(db, day, increments: dict):
+    """Apply `$inc` to one day document; analytics never fail the calling request."""
+    key = day_key(day)
+    increments = {field: amount for field, amount in increments.items() if amount}
+    if key is None or not increments:
+        return
+    try:
+        await db[ROLLUP_COLLECTION].update_one({"_id": key}, {"$inc": increments}, upsert=True)
+    except PyMongoError as e:
+        logger.warning(f"Analytics rollup update failed for {key}: {e}")
+
+
+def _status(value) -> Optional[str]:
+    # AppointmentStatus/ReviewStatus members format as "Class.MEMBER" in f-strings
+    return getattr(value, "value", value)
+
+
+def _revenue(appointment: dict, status: Optional[str]) -> float:
+    return (appointment.get("service_price") or 0) if status in REVENUE_STATUSES else 0
+
+
+async def record_booking(db, appointment: dict, slot: dict):
+    status = _status(appointment["status"])
+    await _increment(db, appointment["created_at"], {
+        "bookings": 1,
+        f"status.{status}": 1,
+        "revenue": _revenue(appointment, status),
+    })
+    await _increment(db, slot["date"], {"slots.booked": 1})
+
+
+async def record_appointment_status(db, appointment: dict, new_status: str):
+    """Move a booking from its stored status to `new_status`."""
+    old_status = _status(appointment.get("status"))
+    new_status = _status(new_status)
+    if old_status == new_status:
+        return
+    await _increment(db, appointment.get("created_at"), {
+        f"status.{old_status}": -1,
+        f"status.{new_status}": 1,
+        "revenue": _revenue(appointment, new_status) - _revenue(appointment, old_status),
+    })
+
+
+async def record_appointment_deleted(db, appointment: dict):
+    """Remove a deleted booking from its day."""
+    status = _status(appointment.get("status"))
+    await _increment(db, appointment.get("created_at"), {
+        "bookings": -1,
+        f"status.{status}": -1,
+        "revenue": -_revenue(appointment, status),
+    })
+
+
+async def record_slot_released(db, slot_date):
+    await _increment(db, slot_date, {"slots.booked": -1})
+
+
+async def record_slots_created(db, slots: Iterable[dict]):
+    per_day = TallyCounter(day_key(slot["date"]) for slot in slots)
+    if not per_day:
+        return
+    try:
+        await db[ROLLUP_COLLECTION].bulk_write([
+            UpdateOne({"_id": key}, {"$inc": {"slots.total": count}}, upsert=True)
+            for key, count in per_day.items()
+        ], ordered=False)
+    except PyMongoError as e:
+        logger.warning(f"Analytics slot rollup update failed: {e}")
+
+
+async def record_slot_deleted(db, slot: dict):
+    await _increment(db, slot["date"], {
+        "slots.total": -1,
+        "slots.booked": 0 if slot.get("is_available", True) else -1,
+    })
+
+
+async def record_review_status(db, review: dict, new_status: str):
+    """Count a review in the rating rollup while it is approved."""
+    was_approved = _status(review.get("status")) == "approved"
+    is_approved = _status(new_status) == "approved"
+    if was_approved == is_approved:
+        return
+    sign = 1 if is_approved else -1
+    await _increment(db, review.get("created_at"), {
+        "ratings.count": sign,
+        "ratings.sum": sign * review.get("rating", 0),
+    })
+
+
+def _period_key(day: str, group_by: str) -> str:
+    if group_by == "month":
+        return day[:7]
+    if group_by == "week":
+        monday = date.fromisoformat(day)
+        monday -= timedelta(days=monday.weekday())
+        return monday.isoformat()
+    return day
+
+
+async def get_stats(db, start_date: date, end_date: date, group_by: str = "day") -> dict:
+    """Sum the day documents of [start_date, end_date] into periods and totals."""
+    docs = await db[ROLLUP_COLLECTION].find(
+        {"_id": {"$gte": start_date.isoformat(), "$lte": end_date.isoformat()}}
+    ).sort("_id", 1).to_list(length=None)
+
+    periods: dict = {}
+    totals = _empty_period("total")
+    for doc in docs:
+        key = _period_key(doc["_id"], group_by)
+        period = periods.setdefault(key, _empty_period(key))
+        for target in (period, totals):
+            _add_day(target, doc)
+    return {
+        "start_date": start_date,
+        "end_date": end_date,
+        "group_by": group_by,
+        "periods": [_finish(period) for period in periods.values()],
+        "totals": _finish(totals),
+    }
+
+
+def _empty_period(key: str) -> dict:
+    return {"period": key, "bookings": 0, "by_status": {}, "revenue": 0.0,
+            "ratings_count": 0, "ratings_sum": 0, "slots_total": 0, "slots_booked": 0}
+
+
+def _add_day(period: dict, doc: dict):
+    period["bookings"] += doc.get("bookings", 0)
+    for status, count in (doc.get("status") or {}).items():
+        period["by_status"][status] = period["by_status"].get(status, 0) + count
+    period["revenue"] += doc.get("revenue", 0)
+    period["ratings_count"] += (doc.get("ratings") or {}).get("count", 0)
+    period["ratings_sum"] += (doc.get("ratings") or {}).get("sum", 0)
+    period["slots_total"] += (doc.get("slots") or {}).get("total", 0)
+    period["slots_booked"] += (doc.get("slots") or {}).get("booked", 0)
+
+
+def _finish(period: dict) -> dict:
+    ratings_count = period.pop("ratings_count")
+    ratings_sum = period.pop("ratings_sum")
+    period["revenue"] = round(period["revenue"], 2)
+    period["reviews_approved"] = ratings_count
+    period["average_rating"] = round(ratings_sum / ratings_count, 2) if ratings_count else None
+    period["occupancy_rate"] = (
+        round(period["slots_booked"] / period["slots_total"], 4) if period["slots_total"] else None
+    )
+    return period
+
+
+async def rebuild_rollups(db):
+    """Recompute every day document from the current collections (backfill).
+
+    Each day is replaced in place, so readers never see an empty collection and
+    increments to other days keep applying while the rebuild runs. Days that had a
+    document before the rebuild and no longer have any data are removed.
+    """
+    stale = set(await db[ROLLUP_COLLECTION].distinct("_id"))
+    day = {"$dateToString": {"format": "%Y-%m-%d", "date": "$created_at"}}
+    rollups: dict = {}
+
+    def entry(key: str) -> dict:
+        return rollups.setdefault(key, {"bookings": 0, "status": {}, "revenue": 0.0,
+                                        "ratings": {"count": 0, "sum": 0},
+                                        "slots": {"total": 0, "booked": 0}})
+
+    async for row in db.appointments.aggregate([
+        {"$unionWith": {"coll": "appointments_archive"}},
+        {"$group": {
+            "_id": {"day": day, "status": "$status"},
+            "count": {"$sum": 1},
+            "revenue": {"$sum": {"$ifNull": ["$service_price", 0]}},
+        }}
+    ]):
+        doc = entry(row["_id"]["day"])
+        doc["bookings"] += row["count"]
+        doc["status"][row["_id"]["status"]] = row["count"]
+        if row["_id"]["status"] in REVENUE_STATUSES:
+            doc["revenue"] += row["revenue"]
+
+    async for row in db.reviews.aggregate([
+        {"$match": {"status": "approved"}},
+        {"$group": {"_id": day, "count": {"$sum": 1}, "sum": {"$sum": "$rating"}}}
+    ]):
+        entry(row["_id"])["ratings"] = {"count": row["count"], "sum": row["sum"]}
+
+    async for row in db.time_slots.aggregate([
+        {"$group": {
+            "_id": {"$dateToString": {"format": "%Y-%m-%d", "date": "$date"}},
+            "total": {"$sum": 1},
+            "booked": {"$sum": {"$cond": ["$is_available", 0, 1]}},
+        }}
+    ]):
+        entry(row["_id"])["slots"] = {"total": row["total"], "booked": row["booked"]}
+
+    rollups.pop(None, None)
+    stale.difference_update(rollups)
+    operations = [ReplaceOne({"_id": key}, doc, upsert=True) for key, doc in rollups.items()]
+    operations += [DeleteOne({"_id": key}) for key in stale]
+    if operations:
+        await db[ROLLUP_COLLECTION].bulk_write(operations, ordered=False)
@@ -0,0 +1,171 @@
+"""Bytes and latency of a 50-item admin appointments page, per pipeline variant.
+
+Variants:
+- full_lookup: the original pipeline, joining whole user and slot documents
+- projected_lookup: pipeline-form $lookup projecting only the response fields
+- snapshots: the current pipeline, reading the client/slot snapshots (no join)
+
+Seeds a throwaway database on a real mongod (mongomock has no pipeline-form
+$lookup), measures wire bytes of the aggregate/getMore replies, serialized
+response bytes and latency, then drops the database.
+
+Run from backend/:  python -m benchmarks.bench_appointment_pipeline --url mongodb://localhost:27017
+"""
+import argparse
+import asyncio
+import statistics
+import time
+import uuid
+from datetime import datetime, timedelta
+
+import bson
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import monitoring
+
+from migrations import MIGRATIONS
+from pipelines import LOOKUP_SLOT, LOOKUP_USER, USER_NAME, appointment_pipeline
+from serialization import appointment_list_serializer
+from snapshots import slot_snapshot, user_snapshot
+
+PAGE = [{"$sort": {"created_at": -1, "id": -1}}, {"$limit": 50}]
+
+FULL_LOOKUP = [
+    *PAGE,
+    {"$lookup": {"from": "users", "localField": "user_id", "foreignField": "id", "as": "user_info"}},
+    {"$lookup": {"from": "time_slots", "localField": "slot_id", "foreignField": "id", "as": "slot_info"}},
+    {"$addFields": {
+        "user_name": USER_NAME,
+        "user_email": {"$arrayElemAt": ["$user_info.email", 0]},
+        "slot_info": {"$arrayElemAt": ["$slot_info", 0]},
+    }},
+    {"$project": {"user_info": 0}},
+]
+
+PROJECTED_LOOKUP = [
+    *PAGE,
+    LOOKUP_USER,
+    LOOKUP_SLOT,
+    {"$addFields": {
+        "user_name": USER_NAME,
+        "user_email": {"$arrayElemAt": ["$user_info.email", 0]},
+        "slot_info": {"$arrayElemAt": ["$slot_info", 0]},
+    }},
+    {"$project": {"_id": 0, "user_info": 0}},
+]
+
+VARIANTS = {
+    "full_lookup": FULL_LOOKUP,
+    "projected_lookup": PROJECTED_LOOKUP,
+    "snapshots": appointment_pipeline(page=PAGE),
+}
+
+
+class ReplyBytes(monitoring.CommandListener):
+    """Adds up the BSON size of aggregate/getMore replies."""
+
+    def __init__(self):
+        self.total = 0
+
+    def started(self, event):
+        pass
+
+    def succeeded(self, event):
+        if event.command_name in ("aggregate", "getMore"):
+            self.total += len(bson.encode(event.reply))
+
+    def failed(self, event):
+        pass
+
+
+async def seed(db, appointments: int, users: int):
+    await MIGRATIONS[0].apply(db)
+    now = datetime.utcnow()
+    user_docs = [{
+        "id": str(uuid.uuid4()),
+        "email": f"client{i}@example.com",
+        "password_hash": "$2b$12$" + "x" * 53,
+        "first_name": "Client",
+        "last_name": f"Numéro {i}",
+        "phone": "0600000000",
+        "role": "client",
+        "is_active": True,
+        "created_at": now,
+        "updated_at": now,
+    } for i in range(users)]
+    slot_docs, appointment_docs = [], []
+    for i in range(appointments):
+        slot = {
+            "id": str(uuid.uuid4()),
+            "date": now + timedelta(hours=i),
+            "start_time": "10:00",
+            "end_time": "11:00",
+            "service_name": "HennaLash",
+            "service_duration": 60,
+            "price": 15.0,
+            "is_available": False,
+            "created_by": "admin",
+            "created_at": now,
+        }
+        user = user_docs[i % users]
+        slot_docs.append(slot)
+        appointment_docs.append({
+            "id": str(uuid.uuid4()),
+            "user_id": user["id"],
+            "slot_id": slot["id"],
+            "service_name": "HennaLash",
+            "service_price": 15.0,
+            "status": "pending",
+            "notes": "Première visite",
+            "created_at": now - timedelta(minutes=i),
+            "updated_at": now,
+            **user_snapshot(user),
+            "slot_info": slot_snapshot(slot),
+        })
+    await db.users.insert_many(user_docs)
+    await db.time_slots.insert_many(slot_docs)
+    await db.appointments.insert_many(appointment_docs)
+
+
+async def measure(db, listener: ReplyBytes, pipeline, repeat: int) -> dict:
+    # Warm-up, and the serialized size of one page
+    page = await db.appointments.aggregate(pipeline).to_list(length=None)
+    response_bytes = len(appointment_list_serializer.dump(page))
+    listener.total = 0
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        await db.appointments.aggregate(pipeline).to_list(length=None)
+        timings.append(time.perf_counter() - start)
+    return {
+        "wire_bytes": listener.total // repeat,
+        "response_bytes": response_bytes,
+        "p50_ms": statistics.median(timings) * 1000,
+        "p95_ms": statistics.quantiles(timings, n=20)[18] * 1000,
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", default="mongodb://localhost:27017")
+    parser.add_argument("--appointments", type=int, default=5000)
+    parser.add_argument("--users", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    listener = ReplyBytes()
+    client = AsyncIOMotorClient(args.url, event_listeners=[listener])
+    db = client[f"hennalash_bench_{uuid.uuid4().hex[:8]}"]
+    try:
+        await seed(db, args.appointments, args.users)
+        print(f"{'variant':<18} {'wire bytes':>11} {'response bytes':>15} {'p50 ms':>8} {'p95 ms':>8}")
+        for name, pipeline in VARIANTS.items():
+            result = await measure(db, listener, pipeline, args.repeat)
+            print(f"{name:<18} {result['wire_bytes']:>11,} {result['response_bytes']:>15,} "
+                  f"{result['p50_ms']:>8.2f} {result['p95_ms']:>8.2f}")
+    finally:
+        await client.drop_database(db.name)
+        client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,98 @@
+"""Per-item cost of list responses: FastAPI response_model path vs ListSerializer.
+
+"Before" builds a model per document, then lets FastAPI validate the list against
+`response_model`, run `jsonable_encoder` and encode with JSONResponse, as the
+list endpoints used to. "After" is the precompiled TypeAdapter in serialization.py.
+
+Run from backend/:  python -m benchmarks.bench_serialization [--sizes 50 500 5000]
+"""
+import argparse
+import asyncio
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import List
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+
+from models import AppointmentResponse, ReviewResponse, TimeSlotResponse
+from serialization import appointment_list_serializer, review_list_serializer, slot_list_serializer
+
+
+def slot_doc(i: int) -> dict:
+    now = datetime.utcnow()
+    return {
+        "id": str(uuid.uuid4()), "date": now + timedelta(hours=i), "start_time": "10:00", "end_time": "11:00",
+        "service_name": "HennaLash", "service_duration": 60, "price": 15.0, "is_available": True,
+        "created_by": "admin", "created_at": now,
+    }
+
+
+def appointment_doc(i: int) -> dict:
+    now = datetime.utcnow()
+    slot = slot_doc(i)
+    return {
+        "id": str(uuid.uuid4()), "user_id": str(uuid.uuid4()), "slot_id": slot["id"],
+        "service_name": "HennaLash", "service_price": 15.0, "status": "pending", "notes": "Première visite",
+        "created_at": now, "updated_at": now, "user_name": f"Client {i}", "user_email": f"client{i}@example.com",
+        "slot_info": slot,
+    }
+
+
+def review_doc(i: int) -> dict:
+    now = datetime.utcnow()
+    return {
+        "id": str(uuid.uuid4()), "user_id": str(uuid.uuid4()), "rating": 1 + i % 5,
+        "comment": "Très satisfaite du résultat, je recommande !", "status": "approved",
+        "created_at": now, "updated_at": now, "user_name": f"Client {i}",
+    }
+
+
+CASES = [
+    ("slots", TimeSlotResponse, slot_list_serializer, slot_doc),
+    ("appointments", AppointmentResponse, appointment_list_serializer, appointment_doc),
+    ("reviews", ReviewResponse, review_list_serializer, review_doc),
+]
+
+
+def seconds_per_call(call, seconds: float) -> float:
+    calls = 0
+    start = time.perf_counter()
+    while True:
+        call()
+        calls += 1
+        elapsed = time.perf_counter() - start
+        if elapsed >= seconds:
+            return elapsed / calls
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[50, 500, 5000])
+    parser.add_argument("--seconds", type=float, default=1.0, help="Measuring time per case and variant")
+    args = parser.parse_args()
+    loop = asyncio.new_event_loop()
+
+    print(f"{'endpoint':<13} {'items':>6} {'before µs/item':>15} {'after µs/item':>14} {'speedup':>8}")
+    for name, model, serializer, make_doc in CASES:
+        field = create_response_field(name=f"Response_{name}", type_=List[model])
+        for size in args.sizes:
+            docs = [make_doc(i) for i in range(size)]
+
+            def before():
+                content = [model(**doc) for doc in docs]
+                JSONResponse(loop.run_until_complete(serialize_response(field=field, response_content=content)))
+
+            def after():
+                serializer.dump(docs)
+
+            before_cost = seconds_per_call(before, args.seconds) / size * 1e6
+            after_cost = seconds_per_call(after, args.seconds) / size * 1e6
+            print(f"{name:<13} {size:>6} {before_cost:>15.2f} {after_cost:>14.2f} {before_cost / after_cost:>7.1f}x")
+    loop.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+import inspect
+import logging
+import os
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, Dict, Optional
+
+from pymongo.errors import PyMongoError
+
+from change_watcher import ChangeStreamWatcher
+
+logger = logging.getLogger(__name__)
+
+# Une entrée par écriture ; purgée par l'index TTL (migration 6)
+INVALIDATIONS_COLLECTION = "cache_invalidations"
+# Intervalle de lecture quand les change streams ne sont pas disponibles
+CACHE_INVALIDATION_POLL_INTERVAL = float(os.environ.get("CACHE_INVALIDATION_POLL_INTERVAL", "2"))
+# Re-read window covering clock skew between workers (invalidating twice is harmless)
+CACHE_INVALIDATION_OVERLAP = timedelta(seconds=5)
+
+# Namespaces other than the response cache ones (response_cache.PUBLIC_*)
+USERS = "users"  # key: email
+ADMIN_RECIPIENTS = "admin_recipients"
+MAINTENANCE = "maintenance"
+
+# Handler(key): key None means "drop everything in this namespace"; may be async
+Handler = Callable[[Optional[str]], Optional[Awaitable[None]]]
+
+
+class CacheInvalidator(ChangeStreamWatcher):
+    """Propagates cache invalidations to every worker process.
+
+    `publish` drops the entry locally and records it in `cache_invalidations`;
+    each worker applies the recorded invalidations from a change stream, or by
+    polling every `poll_interval` seconds when change streams are not supported.
+    After the stream (re)connects every registered cache is cleared, since
+    invalidations may have been missed while it was closed.
+    """
+
+    description = "Cache invalidation stream"
+
+    def __init__(self, poll_interval: float = CACHE_INVALIDATION_POLL_INTERVAL):
+        super().__init__(poll_interval)
+        self._handlers: Dict[str, Handler] = {}
+        self._since: Optional[datetime] = None
+        self._applied: Dict[object, datetime] = {}  # _id -> created_at, within the overlap window
+
+    def register(self, namespace: str, handler: Handler):
+        self._handlers[namespace] = handler
+
+    async def apply(self, namespace: str, key: Optional[str] = None):
+        handler = self._handlers.get(namespace)
+        if handler is not None:
+            result = handler(key)
+            if inspect.isawaitable(result):
+                await result
+
+    async def clear_all(self):
+        for namespace in self._handlers:
+            await self.apply(namespace)
+
+    async def publish(self, db, namespace: str, key: Optional[str] = None):
+        """Invalidate here, then in the other workers; never fails the calling request."""
+        await self.apply(namespace, key)
+        try:
+            await db[INVALIDATIONS_COLLECTION].insert_one(
+                {"namespace": namespace, "key": key, "created_at": datetime.utcnow()}
+            )
+        except PyMongoError as e:
+            logger.warning(f"Cache invalidation broadcast failed for {namespace}: {e}")
+
+    def open_stream(self, db, resume_after):
+        return db[INVALIDATIONS_COLLECTION].watch([{"$match": {"operationType": "insert"}}])
+
+    async def on_open(self, db, stream, resumed: bool):
+        await self.clear_all()
+
+    async def on_change(self, db, change: dict):
+        document = change["fullDocument"]
+        await self.apply(document["namespace"], document.get("key"))
+
+    async def poll(self, db):
+        if self._since is None:
+            self._since = datetime.utcnow()
+        try:
+            async for document in db[INVALIDATIONS_COLLECTION].find(
+                {"created_at": {"$gt": self._since - CACHE_INVALIDATION_OVERLAP}}
+            ).sort("created_at", 1):
+                if document["_id"] in self._applied:
+                    continue
+                await self.apply(document["namespace"], document.get("key"))
+                self._applied[document["_id"]] = document["created_at"]
+                self._since = max(self._since, document["created_at"])
+        finally:
+            self._applied = {_id: created_at for _id, created_at in self._applied.items()
+                             if created_at > self._since - CACHE_INVALIDATION_OVERLAP}
+
+
+# Global invalidator, one watcher per worker process
+cache_invalidator = CacheInvalidator()
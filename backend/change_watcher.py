@@ -0,0 +1,108 @@
+import asyncio
+import logging
+import os
+from typing import Optional
+
+from pymongo.errors import OperationFailure, PyMongoError
+
+from database import get_database
+
+logger = logging.getLogger(__name__)
+
+CHANGE_STREAM_RETRY_SECONDS = float(os.environ.get("CHANGE_STREAM_RETRY_SECONDS", "5"))
+
+
+class ChangeStreamWatcher:
+    """Background task that follows one change stream, with a fallback without replica set.
+
+    Subclasses open the stream (`open_stream`) and handle its changes (`on_change`);
+    `on_open` runs each time the stream is (re)opened, before its first change.
+    Resumable watchers reopen after the last change seen, from the token kept by
+    `save_resume_token` (in memory unless overridden); when that token can no longer
+    be resumed the stream restarts from now.
+
+    Change streams require a replica set: on a standalone server `fallback` runs
+    instead, by default `poll` every `poll_interval` seconds. Other database errors
+    reopen the stream after `retry_seconds`.
+    """
+
+    description = "Change stream"
+    resumable = False
+
+    def __init__(self, poll_interval: float, retry_seconds: float = CHANGE_STREAM_RETRY_SECONDS):
+        self.poll_interval = poll_interval
+        self.retry_seconds = retry_seconds
+        self._task: Optional[asyncio.Task] = None
+        self._resume_token = None
+
+    async def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def open_stream(self, db, resume_after):
+        raise NotImplementedError
+
+    async def on_open(self, db, stream, resumed: bool):
+        pass
+
+    async def on_change(self, db, change: dict):
+        raise NotImplementedError
+
+    async def poll(self, db):
+        pass
+
+    async def load_resume_token(self, db):
+        return self._resume_token
+
+    async def save_resume_token(self, db, resume_token):
+        self._resume_token = resume_token
+
+    async def fallback(self, db):
+        logger.info(f"{self.description}: polling every {self.poll_interval}s")
+        while True:
+            try:
+                await self.poll(db)
+            except PyMongoError as e:
+                logger.warning(f"{self.description} poll failed: {e}")
+            await asyncio.sleep(self.poll_interval)
+
+    async def _run(self):
+        db = await get_database()
+        resume_token = None
+        while self.resumable:
+            try:
+                resume_token = await self.load_resume_token(db)
+                break
+            except PyMongoError as e:
+                logger.warning(f"{self.description} resume token unavailable: {e}")
+                await asyncio.sleep(self.retry_seconds)
+        while True:
+            try:
+                async with self.open_stream(db, resume_token) as stream:
+                    await self.on_open(db, stream, resumed=resume_token is not None)
+                    async for change in stream:
+                        await self.on_change(db, change)
+                        if self.resumable:
+                            resume_token = stream.resume_token
+                            await self.save_resume_token(db, resume_token)
+            except OperationFailure as e:
+                if resume_token is not None:
+                    # Token no longer in the oplog - start over from now
+                    logger.warning(f"{self.description} resume failed ({e}), restarting from now")
+                    resume_token = None
+                    continue
+                logger.info(f"{self.description} unavailable ({e}), change streams require a replica set")
+                await self.fallback(db)
+                return
+            except PyMongoError as e:
+                logger.warning(f"{self.description} interrupted: {e}")
+                await asyncio.sleep(self.retry_seconds)
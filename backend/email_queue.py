@@ -0,0 +1,221 @@
+import asyncio
+import logging
+import os
+import uuid
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+from pymongo import ReturnDocument
+
+from email_service import email_service
+from metrics import emails_total
+
+logger = logging.getLogger(__name__)
+
+# Outbox settings
+EMAIL_MAX_ATTEMPTS = int(os.environ.get("EMAIL_MAX_ATTEMPTS", "6"))
+EMAIL_RETRY_BASE_SECONDS = float(os.environ.get("EMAIL_RETRY_BASE_SECONDS", "30"))
+EMAIL_RETRY_MAX_SECONDS = float(os.environ.get("EMAIL_RETRY_MAX_SECONDS", "3600"))
+EMAIL_LEASE_SECONDS = float(os.environ.get("EMAIL_LEASE_SECONDS", "120"))  # Claimed jobs are retaken after this
+# Fenêtre de regroupement des notifications admin (0 = envoi immédiat, un email par événement)
+ADMIN_DIGEST_WINDOW = float(os.environ.get("ADMIN_DIGEST_WINDOW", "0"))  # seconds
+
+OUTBOX_COLLECTION = "email_outbox"
+DEAD_LETTER_COLLECTION = "email_dead_letters"
+
+# Type de notification -> méthode d'EmailService
+EMAIL_SENDERS = {
+    "appointment_notification": "send_appointment_notification",
+    "appointment_confirmation": "send_appointment_confirmation_to_client",
+    "appointment_cancellation": "send_appointment_cancellation_to_client",
+    "review_notification": "send_review_notification",
+    "password_reset": "send_password_reset_email",
+}
+
+
+# Admin notifications that can be coalesced into one digest per recipient
+DIGEST_TYPES = {"appointment_notification", "review_notification"}
+
+
+class PoisonMessage(Exception):
+    """A job that can never be delivered (unknown type, invalid payload)."""
+
+
+def _new_job(kind: str, payload: dict) -> dict:
+    if kind not in EMAIL_SENDERS:
+        raise ValueError(f"Unknown email type: {kind}")
+    now = datetime.utcnow()
+    job = {
+        "id": str(uuid.uuid4()),
+        "type": kind,
+        "payload": payload,
+        "status": "pending",
+        "attempts": 0,
+        "next_attempt_at": now,
+        "locked_until": None,
+        "last_error": None,
+        "created_at": now,
+    }
+    if ADMIN_DIGEST_WINDOW > 0 and kind in DIGEST_TYPES:
+        # Held until the window closes, then sent with the others for this admin
+        job["digest_to"] = payload["admin_email"]
+        job["next_attempt_at"] = now + timedelta(seconds=ADMIN_DIGEST_WINDOW)
+    return job
+
+
+async def enqueue_email(db, kind: str, **payload):
+    """Add one email to the outbox (single insert)."""
+    await db[OUTBOX_COLLECTION].insert_one(_new_job(kind, payload))
+
+
+async def enqueue_emails(db, kind: str, payloads: List[dict]):
+    """Add several emails of the same type to the outbox in one round-trip."""
+    if payloads:
+        await db[OUTBOX_COLLECTION].insert_many([_new_job(kind, payload) for payload in payloads], ordered=False)
+
+
+def retry_delay(attempts: int) -> timedelta:
+    """Exponential backoff for the given number of failed attempts."""
+    return timedelta(seconds=min(EMAIL_RETRY_BASE_SECONDS * (2 ** (attempts - 1)), EMAIL_RETRY_MAX_SECONDS))
+
+
+async def claim_job(db, worker_id: str) -> Optional[dict]:
+    """Atomically take the next due job, or one whose lease has expired."""
+    now = datetime.utcnow()
+    return await db[OUTBOX_COLLECTION].find_one_and_update(
+        {
+            "$or": [
+                {"status": "pending", "next_attempt_at": {"$lte": now}},
+                {"status": "processing", "locked_until": {"$lt": now}},
+            ]
+        },
+        {
+            "$set": {
+                "status": "processing",
+                "locked_by": worker_id,
+                "locked_until": now + timedelta(seconds=EMAIL_LEASE_SECONDS),
+            },
+            "$inc": {"attempts": 1},
+        },
+        sort=[("next_attempt_at", 1)],
+        return_document=ReturnDocument.AFTER,
+    )
+
+
+async def claim_digest_items(db, job: dict, worker_id: str) -> List[dict]:
+    """Claim every other pending notification for the digest recipient of `job`."""
+    await db[OUTBOX_COLLECTION].update_many(
+        {"status": "pending", "digest_to": job["digest_to"], "id": {"$ne": job["id"]}},
+        {
+            "$set": {
+                "status": "processing",
+                "locked_by": worker_id,
+                "locked_until": job["locked_until"],
+                "digest_parent": job["id"],
+            },
+            "$inc": {"attempts": 1},
+        }
+    )
+    siblings = await db[OUTBOX_COLLECTION].find(
+        {"digest_parent": job["id"], "status": "processing"}
+    ).sort("created_at", 1).to_list(length=None)
+    return [job] + siblings
+
+
+async def claim_jobs(db, worker_id: str, batch_size: int) -> List[dict]:
+    """Claim up to `batch_size` due jobs (a digest counts as one job)."""
+    jobs = []
+    while len(jobs) < batch_size:
+        job = await claim_job(db, worker_id)
+        if job is None:
+            break
+        if job.get("digest_to"):
+            job["digest_items"] = await claim_digest_items(db, job, worker_id)
+        jobs.append(job)
+    return jobs
+
+
+def job_ids(job: dict) -> List[str]:
+    return [item["id"] for item in job.get("digest_items") or [job]]
+
+
+async def send_job(job: dict) -> bool:
+    """Deliver a job through EmailService."""
+    items = job.get("digest_items") or []
+    if len(items) > 1:
+        return await email_service.send_admin_digest(
+            job["digest_to"], [(item["type"], item["payload"]) for item in items]
+        )
+    method_name = EMAIL_SENDERS.get(job.get("type"))
+    if method_name is None:
+        raise PoisonMessage(f"Unknown email type: {job.get('type')}")
+    try:
+        sender = getattr(email_service, method_name)
+        return await sender(**job["payload"])
+    except TypeError as e:
+        raise PoisonMessage(f"Invalid payload: {e}")
+
+
+async def move_to_dead_letter(db, job: dict, error: str):
+    items = job.pop("digest_items", None) or [job]
+    failed_at = datetime.utcnow()
+    for item in items:
+        item.pop("_id", None)
+        item.pop("digest_items", None)
+        item.update({"status": "dead", "last_error": error, "failed_at": failed_at})
+    await db[DEAD_LETTER_COLLECTION].insert_many(items)
+    await db[OUTBOX_COLLECTION].delete_many({"id": {"$in": [item["id"] for item in items]}})
+    logger.error(f"Email job {job['id']} ({job['type']}) moved to dead letters: {error}")
+
+
+async def process_job(db, job: dict):
+    """Send a claimed job, then delete it, reschedule it or dead-letter it."""
+    try:
+        sent = await send_job(job)
+        error = None if sent else "Delivery failed"
+    except PoisonMessage as e:
+        await move_to_dead_letter(db, job, str(e))
+        emails_total.labels(job.get("type", "unknown"), "dead_letter").inc()
+        return
+    except Exception as e:
+        error = str(e)
+
+    if error is None:
+        await db[OUTBOX_COLLECTION].delete_many({"id": {"$in": job_ids(job)}})
+        emails_total.labels(job["type"], "sent").inc()
+        return
+
+    if job["attempts"] >= EMAIL_MAX_ATTEMPTS:
+        await move_to_dead_letter(db, job, error)
+        emails_total.labels(job["type"], "dead_letter").inc()
+        return
+
+    emails_total.labels(job["type"], "failed").inc()
+    await db[OUTBOX_COLLECTION].update_many(
+        {"id": {"$in": job_ids(job)}},
+        {"$set": {
+            "status": "pending",
+            "locked_by": None,
+            "locked_until": None,
+            "digest_parent": None,
+            "last_error": error,
+            "next_attempt_at": datetime.utcnow() + retry_delay(job["attempts"]),
+        }}
+    )
+    logger.warning(f"Email job {job['id']} failed (attempt {job['attempts']}): {error}")
+
+
+async def process_lane(db, jobs: List[dict]):
+    """Send jobs one after another over a single SMTP session."""
+    async with email_service.session():
+        for job in jobs:
+            await process_job(db, job)
+
+
+async def process_batch(db, worker_id: str, batch_size: int) -> int:
+    """Claim one batch and send it over at most SMTP_POOL_SIZE sessions. Returns the batch size."""
+    jobs = await claim_jobs(db, worker_id, batch_size)
+    if jobs:
+        lanes = min(len(jobs), email_service.pool.size)
+        await asyncio.gather(*(process_lane(db, jobs[i::lanes]) for i in range(lanes)))
+    return len(jobs)
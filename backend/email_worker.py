@@ -0,0 +1,86 @@
+"""Outbound email worker.
+
+Usage (from the backend directory):
+    python -m email_worker
+"""
+import asyncio
+import logging
+import os
+import signal
+import socket
+import sys
+
+from database import close_db_connection, get_database
+from email_queue import process_batch
+from email_service import email_service
+from metrics import METRICS_CONTENT_TYPE, registry
+
+logger = logging.getLogger("email_worker")
+
+EMAIL_WORKER_BATCH_SIZE = int(os.environ.get("EMAIL_WORKER_BATCH_SIZE", "10"))
+EMAIL_WORKER_POLL_INTERVAL = float(os.environ.get("EMAIL_WORKER_POLL_INTERVAL", "2"))
+# Port of the Prometheus scrape endpoint (disabled when unset)
+EMAIL_WORKER_METRICS_PORT = os.environ.get("EMAIL_WORKER_METRICS_PORT")
+
+
+async def serve_metrics(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+    """Minimal HTTP responder: every request gets the metrics page."""
+    try:
+        await reader.readuntil(b"\r\n\r\n")
+        body = registry.render().encode()
+        writer.write(
+            b"HTTP/1.1 200 OK\r\n"
+            + f"Content-Type: {METRICS_CONTENT_TYPE}\r\nContent-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode()
+            + body
+        )
+        await writer.drain()
+    except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+        pass
+    finally:
+        writer.close()
+
+
+async def run_worker(batch_size: int = EMAIL_WORKER_BATCH_SIZE,
+                     poll_interval: float = EMAIL_WORKER_POLL_INTERVAL):
+    """Drain the outbox until SIGINT/SIGTERM."""
+    worker_id = f"{socket.gethostname()}:{os.getpid()}"
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+
+    db = await get_database()
+    metrics_server = None
+    if EMAIL_WORKER_METRICS_PORT:
+        metrics_server = await asyncio.start_server(serve_metrics, "0.0.0.0", int(EMAIL_WORKER_METRICS_PORT))
+    logger.info(f"Email worker {worker_id} started (batch={batch_size})")
+    try:
+        while not stop.is_set():
+            try:
+                processed = await process_batch(db, worker_id, batch_size)
+            except Exception as e:
+                logger.error(f"Email worker batch failed: {e}")
+                processed = 0
+            if processed < batch_size:
+                try:
+                    await asyncio.wait_for(stop.wait(), timeout=poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+    finally:
+        if metrics_server is not None:
+            metrics_server.close()
+        await email_service.close()
+        await close_db_connection()
+        logger.info(f"Email worker {worker_id} stopped")
+
+
+def main():
+    logging.basicConfig(level=logging.INFO)
+    if not email_service.enabled:
+        logger.error("Gmail credentials not configured - refusing to drain the email outbox")
+        sys.exit(1)
+    asyncio.run(run_worker())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""Gunicorn settings for the multi-worker deployment.
+
+Usage (from the backend directory):
+    gunicorn server:app -c gunicorn.conf.py
+
+Each worker is a separate uvicorn event loop. Per-process resources (Motor client,
+bcrypt threads, SMTP connections, cache invalidation watcher) are created lazily or in the
+FastAPI startup event, so the app module can be imported before fork (preload).
+
+Caches stay per worker (users, public responses, admin recipients, maintenance state);
+a write in one worker invalidates them in all workers through
+cache_invalidation.CacheInvalidator.
+"""
+import multiprocessing
+import os
+
+from uvicorn.workers import UvicornWorker
+
+# Graceful drain: on SIGTERM workers stop accepting and finish in-flight requests
+graceful_timeout = int(os.environ.get("GRACEFUL_TIMEOUT", "30"))
+# Part of graceful_timeout kept for the FastAPI shutdown event (caches, bcrypt pool, Mongo)
+SHUTDOWN_EVENT_SECONDS = int(os.environ.get("SHUTDOWN_EVENT_SECONDS", "10"))
+
+
+class DrainingUvicornWorker(UvicornWorker):
+    """UvicornWorker that cancels responses still open when the drain time is up.
+
+    uvicorn runs the shutdown event only once every response has finished, and
+    SSE streams last up to SSE_MAX_STREAM_SECONDS; without a limit gunicorn would
+    SIGKILL the worker at graceful_timeout before the shutdown event ran.
+    """
+
+    CONFIG_KWARGS = {
+        **UvicornWorker.CONFIG_KWARGS,
+        "timeout_graceful_shutdown": max(graceful_timeout - SHUTDOWN_EVENT_SECONDS, 1),
+    }
+
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '8001')}"
+workers = int(os.environ.get("WEB_CONCURRENCY", multiprocessing.cpu_count()))
+worker_class = DrainingUvicornWorker
+preload_app = os.environ.get("GUNICORN_PRELOAD", "true").lower() == "true"
+
+timeout = int(os.environ.get("GUNICORN_TIMEOUT", "60"))
+keepalive = int(os.environ.get("GUNICORN_KEEPALIVE", "5"))
+
+# Recycle workers periodically, staggered so they do not restart together
+max_requests = int(os.environ.get("GUNICORN_MAX_REQUESTS", "0"))
+max_requests_jitter = max_requests // 10
+
+accesslog = "-"
+errorlog = "-"
+
+
+def post_fork(server, worker):
+    server.log.info(f"Worker {worker.pid} started")
+
+
+def worker_exit(server, worker):
+    server.log.info(f"Worker {worker.pid} exited")
@@ -0,0 +1,182 @@
+import asyncio
+import json
+import os
+import secrets
+from datetime import datetime, timedelta
+from typing import Optional, Set
+
+from change_watcher import ChangeStreamWatcher
+from metrics import Gauge, registry
+
+# Événements par abonné en attente d'envoi ; au-delà l'abonné lent est déconnecté
+SSE_QUEUE_SIZE = int(os.environ.get("SSE_QUEUE_SIZE", "100"))
+SSE_HEARTBEAT_SECONDS = float(os.environ.get("SSE_HEARTBEAT_SECONDS", "15"))
+SSE_RETRY_MS = int(os.environ.get("SSE_RETRY_MS", "5000"))
+# Streams are closed after this long (clients reconnect); on shutdown, streams still
+# open are cancelled by the worker's graceful timeout (gunicorn.conf.py)
+SSE_MAX_STREAM_SECONDS = float(os.environ.get("SSE_MAX_STREAM_SECONDS", "300"))
+
+# Tickets d'accès au flux : usage unique, durée courte, partagés entre workers
+SSE_TICKETS_COLLECTION = "sse_tickets"
+SSE_TICKET_TTL_SECONDS = int(os.environ.get("SSE_TICKET_TTL_SECONDS", "30"))
+
+# Collection -> event prefix and the fields sent with its events
+WATCHED_COLLECTIONS = {
+    "time_slots": ("slot", ["id", "date", "start_time", "end_time", "service_name",
+                            "service_duration", "price", "is_available"]),
+    "appointments": ("appointment", ["id", "user_id", "slot_id", "service_name", "status",
+                                     "created_at", "updated_at"]),
+    "reviews": ("review", ["id", "user_id", "rating", "status", "created_at", "updated_at"]),
+}
+# Events clients (and anonymous visitors) may receive; admins receive everything
+PUBLIC_EVENT_PREFIXES = ("slot.",)
+
+OPERATION_NAMES = {"insert": "created", "update": "updated", "replace": "updated", "delete": "deleted"}
+
+sse_subscribers = registry.register(Gauge("hennalash_sse_subscribers", "Connected SSE subscribers."))
+
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+def event_from_change(change: dict) -> Optional[dict]:
+    """Turn a change stream document into a `{type, data}` event."""
+    watched = WATCHED_COLLECTIONS.get(change["ns"]["coll"])
+    operation = OPERATION_NAMES.get(change["operationType"])
+    if watched is None or operation is None:
+        return None
+    prefix, fields = watched
+    document = change.get("fullDocument") or {}
+    # Deletes carry no document: clients reload the affected listing
+    data = {field: document[field] for field in fields if field in document}
+    return {"type": f"{prefix}.{operation}", "data": data}
+
+
+def format_sse(event: dict) -> str:
+    return f"event: {event['type']}\ndata: {json.dumps(event['data'], default=_json_default)}\n\n"
+
+
+async def issue_ticket(db, user_id: str, is_admin: bool) -> str:
+    """Ticket redeemable once by GET /api/events, so the access token never goes in a URL."""
+    ticket = secrets.token_urlsafe(32)
+    await db[SSE_TICKETS_COLLECTION].insert_one({
+        "_id": ticket,
+        "user_id": user_id,
+        "is_admin": is_admin,
+        "expires_at": datetime.utcnow() + timedelta(seconds=SSE_TICKET_TTL_SECONDS),
+    })
+    return ticket
+
+
+async def redeem_ticket(db, ticket: str) -> Optional[dict]:
+    """Consume a ticket; None when it is unknown, already used or expired."""
+    return await db[SSE_TICKETS_COLLECTION].find_one_and_delete(
+        {"_id": ticket, "expires_at": {"$gt": datetime.utcnow()}}
+    )
+
+
+class Subscriber:
+    __slots__ = ("queue", "is_admin", "closed")
+
+    def __init__(self, is_admin: bool):
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=SSE_QUEUE_SIZE)
+        self.is_admin = is_admin
+        self.closed = False
+
+    def accepts(self, event: dict) -> bool:
+        return self.is_admin or event["type"].startswith(PUBLIC_EVENT_PREFIXES)
+
+
+class EventBroker(ChangeStreamWatcher):
+    """Fans out one change stream per worker to every connected SSE subscriber.
+
+    The stream is opened with the first subscriber and resumed from its last token
+    after interruptions. Without a replica set there are no change streams: the broker
+    reports `live = False` and clients keep polling.
+    """
+
+    description = "Live events change stream"
+    resumable = True
+
+    def __init__(self):
+        super().__init__(poll_interval=0)
+        self.live = True
+        self._subscribers: Set[Subscriber] = set()
+
+    def subscribe(self, is_admin: bool) -> Subscriber:
+        subscriber = Subscriber(is_admin)
+        self._subscribers.add(subscriber)
+        sse_subscribers.inc()
+        if self._task is None and self.live:
+            self._task = asyncio.create_task(self._run())
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber):
+        if subscriber in self._subscribers:
+            self._subscribers.discard(subscriber)
+            sse_subscribers.dec()
+
+    def publish(self, event: dict):
+        for subscriber in list(self._subscribers):
+            if not subscriber.accepts(event):
+                continue
+            try:
+                subscriber.queue.put_nowait(event)
+            except asyncio.QueueFull:
+                # Too slow to keep up - drop it, the client reconnects and reloads
+                subscriber.closed = True
+                self.unsubscribe(subscriber)
+
+    def open_stream(self, db, resume_after):
+        projection = {"operationType": 1, "ns": 1, "documentKey": 1}
+        for prefix_fields in WATCHED_COLLECTIONS.values():
+            for field in prefix_fields[1]:
+                projection[f"fullDocument.{field}"] = 1
+        pipeline = [
+            {"$match": {
+                "ns.coll": {"$in": list(WATCHED_COLLECTIONS)},
+                "operationType": {"$in": list(OPERATION_NAMES)},
+            }},
+            {"$project": projection},
+        ]
+        return db.watch(pipeline, full_document="updateLookup", resume_after=resume_after)
+
+    async def on_change(self, db, change: dict):
+        event = event_from_change(change)
+        if event is not None:
+            self.publish(event)
+
+    async def fallback(self, db):
+        # Nothing to poll: clients fall back to polling the API
+        self.live = False
+        self._task = None
+
+    async def stream(self, is_admin: bool):
+        """SSE body for one subscriber: events, heartbeats, then close after SSE_MAX_STREAM_SECONDS."""
+        # Subscribed here so that a client gone before the first chunk leaves nothing behind
+        subscriber = self.subscribe(is_admin)
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + SSE_MAX_STREAM_SECONDS
+        try:
+            yield f"retry: {SSE_RETRY_MS}\n\n"
+            yield format_sse({"type": "hello", "data": {"live": self.live}})
+            while not subscriber.closed:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    return
+                try:
+                    event = await asyncio.wait_for(subscriber.queue.get(),
+                                                   timeout=min(SSE_HEARTBEAT_SECONDS, remaining))
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                yield format_sse(event)
+        finally:
+            self.unsubscribe(subscriber)
+
+
+# Global broker, one change stream per worker process
+event_broker = EventBroker()
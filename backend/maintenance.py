@@ -0,0 +1,66 @@
+import logging
+from typing import Optional
+
+from pymongo.errors import PyMongoError
+
+from database import get_database
+
+logger = logging.getLogger(__name__)
+
+MAINTENANCE_DOC_ID = "site_maintenance"
+DEFAULT_MAINTENANCE_MESSAGE = "Site en maintenance. Veuillez réessayer plus tard."
+
+
+def maintenance_state_from_doc(maintenance_doc: Optional[dict]) -> dict:
+    """Convertit le document `maintenance` en état de maintenance."""
+    if not maintenance_doc:
+        # État par défaut si aucun document n'existe
+        return {
+            "is_maintenance": False,
+            "message": DEFAULT_MAINTENANCE_MESSAGE,
+            "enabled_at": None,
+            "enabled_by": None
+        }
+    return {
+        "is_maintenance": maintenance_doc.get("is_maintenance", False),
+        "message": maintenance_doc.get("message", DEFAULT_MAINTENANCE_MESSAGE),
+        "enabled_at": maintenance_doc.get("enabled_at"),
+        "enabled_by": maintenance_doc.get("enabled_by")
+    }
+
+
+class MaintenanceCache:
+    """Process-local copy of the maintenance state.
+
+    Loaded at startup and reloaded whenever the `maintenance` namespace of the
+    cache invalidator is published, so every worker follows the toggles.
+    Reads never touch the database.
+    """
+
+    def __init__(self):
+        self._state = maintenance_state_from_doc(None)
+
+    @property
+    def state(self) -> dict:
+        return self._state
+
+    def set(self, maintenance_state: dict):
+        """Replace the cached state (used by the write paths)."""
+        self._state = maintenance_state_from_doc(maintenance_state)
+
+    async def refresh(self):
+        """Reload the state from the database."""
+        db = await get_database()
+        maintenance_doc = await db.maintenance.find_one({"_id": MAINTENANCE_DOC_ID})
+        self._state = maintenance_state_from_doc(maintenance_doc)
+
+    async def reload(self, key: Optional[str] = None):
+        """Invalidation handler: keep the current state if the database is unreachable."""
+        try:
+            await self.refresh()
+        except PyMongoError as e:
+            logger.warning(f"Maintenance state reload failed: {e}")
+
+
+# Global maintenance cache instance
+maintenance_cache = MaintenanceCache()
@@ -0,0 +1,243 @@
+"""Prometheus text-format metrics, kept in-process per worker.
+
+Every series carries a `worker` label (the pid) so a scrape of any gunicorn worker
+can be summed across workers with `sum without (worker)`.
+"""
+import os
+import time
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, List, Sequence, Tuple
+
+# Upper bounds (seconds) of the request latency histogram buckets
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# Upper bounds (seconds) of the MongoDB pool checkout wait buckets
+CHECKOUT_WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+UNMATCHED_ROUTE = "unmatched"
+METRICS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+EVENT_STREAM_CONTENT_TYPE = b"text/event-stream"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class _Value:
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0.0
+
+    def inc(self, amount: float = 1):
+        self.value += amount
+
+    def dec(self, amount: float = 1):
+        self.value -= amount
+
+    def set(self, value: float):
+        self.value = value
+
+
+class _HistogramValue:
+    __slots__ = ("bounds", "counts", "sum")
+
+    def __init__(self, bounds: Sequence[float]):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)  # Last one is +Inf
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+
+
+class Metric:
+    """A metric family; children per label set are created once and reused."""
+
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], object] = {}
+
+    def _new_child(self):
+        return _Value()
+
+    def labels(self, *values: str):
+        child = self._children.get(values)
+        if child is None:
+            child = self._children[values] = self._new_child()
+        return child
+
+    def samples(self, worker: str) -> Iterable[str]:
+        for values, child in self._children.items():
+            yield f"{self.name}{_labels(self.labelnames, values, worker)} {_number(child.value)}"
+
+    def render(self, worker: str) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}", *self.samples(worker)]
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def inc(self, amount: float = 1):
+        self.labels().inc(amount)
+
+
+class Gauge(Metric):
+    kind = "gauge"
+
+    def inc(self, amount: float = 1):
+        self.labels().inc(amount)
+
+    def dec(self, amount: float = 1):
+        self.labels().dec(amount)
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(buckets)
+
+    def _new_child(self):
+        return _HistogramValue(self.buckets)
+
+    def samples(self, worker: str) -> Iterable[str]:
+        bucket_names = (*self.labelnames, "le")
+        for values, child in self._children.items():
+            cumulative = 0
+            for bound, count in zip((*map(str, self.buckets), "+Inf"), child.counts):
+                cumulative += count
+                yield f"{self.name}_bucket{_labels(bucket_names, (*values, bound), worker)} {cumulative}"
+            yield f"{self.name}_sum{_labels(self.labelnames, values, worker)} {_number(child.sum)}"
+            yield f"{self.name}_count{_labels(self.labelnames, values, worker)} {cumulative}"
+
+
+class Registry:
+    def __init__(self):
+        self.metrics: List[Metric] = []
+        # Callbacks run at scrape time, for values kept elsewhere (cache stats, pool listener)
+        self.collectors: List[Callable[[], Iterable[Metric]]] = []
+
+    def register(self, metric: Metric) -> Metric:
+        self.metrics.append(metric)
+        return metric
+
+    def add_collector(self, collector: Callable[[], Iterable[Metric]]):
+        self.collectors.append(collector)
+
+    def render(self) -> str:
+        worker = f'worker="{os.getpid()}"'
+        lines: List[str] = []
+        for metric in self.metrics:
+            lines.extend(metric.render(worker))
+        for collector in self.collectors:
+            for metric in collector():
+                lines.extend(metric.render(worker))
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+# HTTP metrics (fed by PrometheusMiddleware)
+http_requests_total = registry.register(Counter(
+    "http_requests_total", "HTTP requests by route, method and status code.", ("route", "method", "status")))
+http_request_duration_seconds = registry.register(Histogram(
+    "http_request_duration_seconds", "HTTP request latency by route and method.", ("route", "method")))
+http_requests_in_flight = registry.register(Gauge(
+    "http_requests_in_flight", "HTTP requests currently being served."))
+
+# Business counters
+bookings_total = registry.register(Counter(
+    "hennalash_bookings_total", "Booking attempts by outcome.", ("outcome",)))
+emails_total = registry.register(Counter(
+    "hennalash_emails_total", "Outbox email jobs by outcome.", ("type", "outcome")))
+
+
+def cache_collector(name: str, stats: Callable[[], dict]) -> Callable[[], Iterable[Metric]]:
+    """Export a cache's hits/misses/size counters at scrape time."""
+    def collect() -> Iterable[Metric]:
+        values = stats()
+        lookups = Counter(f"hennalash_{name}_lookups_total", f"{name} lookups by result.", ("result",))
+        lookups.labels("hit").set(values["hits"])
+        lookups.labels("miss").set(values["misses"])
+        size = Gauge(f"hennalash_{name}_entries", f"Entries currently held in {name}.")
+        size.labels().set(values["size"])
+        return [lookups, size]
+    return collect
+
+
+def gauge_collector(name: str, documentation: str, value: Callable[[], float]) -> Callable[[], Iterable[Metric]]:
+    """Export a value kept elsewhere as a gauge, read at scrape time."""
+    def collect() -> Iterable[Metric]:
+        gauge = Gauge(name, documentation)
+        gauge.labels().set(value())
+        return [gauge]
+    return collect
+
+
+class PrometheusMiddleware:
+    """ASGI middleware recording per-route counts, latency and in-flight requests.
+
+    Routes are labelled by their path template (from the matched FastAPI route), so
+    label sets are bounded; `preallocate` creates them once at startup.
+    Server-Sent Events streams stay open for minutes: they are counted in
+    http_requests_total but kept out of the latency histogram and the in-flight gauge.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    @staticmethod
+    def preallocate(routes: Iterable):
+        for route in routes:
+            for method in getattr(route, "methods", None) or ():
+                http_request_duration_seconds.labels(route.path, method)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+        streaming = False
+        start = time.perf_counter()
+        in_flight = http_requests_in_flight.labels()
+
+        async def send_with_status(message):
+            nonlocal status_code, streaming
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                for name, value in message.get("headers", ()):
+                    if name.lower() == b"content-type" and value.startswith(EVENT_STREAM_CONTENT_TYPE):
+                        streaming = True
+                        in_flight.dec()
+            await send(message)
+
+        in_flight.inc()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            route = scope.get("route")
+            path = route.path if route is not None else UNMATCHED_ROUTE
+            method = scope["method"]
+            if not streaming:
+                in_flight.dec()
+                http_request_duration_seconds.labels(path, method).observe(time.perf_counter() - start)
+            http_requests_total.labels(path, method, str(status_code)).inc()
+
@@ -0,0 +1,265 @@
+"""Versioned index migrations.
+
+Applied versions are recorded in the `_migrations` collection, so each step
+runs once per database. Run before starting the API (from the backend directory):
+    python -m migrations            # apply pending migrations
+    python -m migrations --status   # list applied and pending versions
+"""
+import argparse
+import asyncio
+import logging
+import os
+import socket
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from pymongo import ASCENDING, DESCENDING, IndexModel
+from pymongo.errors import DuplicateKeyError, OperationFailure
+
+from analytics import rebuild_rollups, record_slot_deleted
+from database import close_db_connection, get_database
+from review_summary import rebuild_review_summary
+from snapshots import backfill_snapshots
+
+logger = logging.getLogger("migrations")
+
+MIGRATIONS_COLLECTION = "_migrations"
+LOCK_ID = "lock"
+MIGRATION_LOCK_SECONDS = float(os.environ.get("MIGRATION_LOCK_SECONDS", "600"))
+# Dropping an index that is already gone (or whose collection is) is not an error
+NAMESPACE_NOT_FOUND, INDEX_NOT_FOUND = 26, 27
+# Old instances keep serving during the pre-deploy run and may insert new duplicates
+SLOT_DEDUPE_ATTEMPTS = 3
+
+# One slot per date and start time; inserts of a duplicate fail with E11000
+UNIQUE_SLOT_INDEX = IndexModel([("date", ASCENDING), ("start_time", ASCENDING)], unique=True,
+                               name="date_1_start_time_1_unique")
+
+
+class Migration:
+    """One schema version: index drops and creations per collection, then an optional data step."""
+
+    def __init__(self, version: int, description: str,
+                 indexes: Optional[Dict[str, List[IndexModel]]] = None,
+                 run: Optional[Callable[..., Awaitable[None]]] = None,
+                 drop: Optional[Dict[str, List[str]]] = None):
+        self.version = version
+        self.description = description
+        self.indexes = indexes or {}
+        self.run = run
+        self.drop = drop or {}
+
+    async def apply(self, db):
+        for collection, names in self.drop.items():
+            for name in names:
+                await drop_index(db, collection, name)
+        # One createIndexes command per collection, collections in parallel
+        await asyncio.gather(*(
+            db[collection].create_indexes(models) for collection, models in self.indexes.items()
+        ))
+        if self.run is not None:
+            await self.run(db)
+
+
+async def drop_index(db, collection: str, name: str):
+    try:
+        await db[collection].drop_index(name)
+    except OperationFailure as e:
+        if e.code not in (NAMESPACE_NOT_FOUND, INDEX_NOT_FOUND):
+            raise
+
+
+async def dedupe_time_slots(db) -> int:
+    """Delete duplicate (date, start_time) slots, keeping the booked one, else the oldest.
+
+    Several booked slots at the same time each have an appointment pointing at them;
+    those are reported and nothing is deleted, so they can be rescheduled by hand.
+    """
+    groups = await db.time_slots.aggregate([
+        {"$sort": {"is_available": 1, "created_at": 1}},  # Booked slot first
+        {"$group": {
+            "_id": {"date": "$date", "start_time": "$start_time"},
+            "slots": {"$push": {"id": "$id", "date": "$date", "is_available": "$is_available"}},
+            "booked": {"$sum": {"$cond": ["$is_available", 0, 1]}},
+        }},
+        {"$match": {"slots.1": {"$exists": True}}},
+    ], allowDiskUse=True).to_list(length=None)
+
+    conflicts = [group for group in groups if group["booked"] > 1]
+    if conflicts:
+        details = "; ".join(
+            f"{group['_id']['date']} {group['_id']['start_time']}: "
+            + ", ".join(slot["id"] for slot in group["slots"] if not slot["is_available"])
+            for group in conflicts
+        )
+        raise RuntimeError(f"Booked duplicate time slots must be resolved before deduplicating: {details}")
+
+    removed = 0
+    for group in groups:
+        duplicates = group["slots"][1:]
+        await db.time_slots.delete_many({"id": {"$in": [slot["id"] for slot in duplicates]}})
+        for slot in duplicates:
+            await record_slot_deleted(db, slot)
+        removed += len(duplicates)
+    return removed
+
+
+async def create_unique_slot_index(db):
+    for attempt in range(SLOT_DEDUPE_ATTEMPTS):
+        removed = await dedupe_time_slots(db)
+        if removed:
+            logger.info(f"Removed {removed} duplicate time slots")
+        try:
+            await db.time_slots.create_indexes([UNIQUE_SLOT_INDEX])
+            return
+        except DuplicateKeyError:
+            if attempt == SLOT_DEDUPE_ATTEMPTS - 1:
+                raise
+
+
+MIGRATIONS: List[Migration] = [
+    Migration(1, "Baseline indexes", {
+        "users": [
+            IndexModel("email", unique=True),
+            IndexModel("id", unique=True),
+            IndexModel("role"),  # For admin queries
+        ],
+        "appointments": [
+            IndexModel("user_id"),
+            IndexModel("slot_id"),
+            IndexModel("status"),
+            IndexModel("id", unique=True),
+            IndexModel([("created_at", DESCENDING), ("id", DESCENDING)]),  # Most recent first (keyset)
+            IndexModel([("user_id", ASCENDING), ("created_at", DESCENDING), ("id", DESCENDING)]),  # User's appointments
+            IndexModel([("status", ASCENDING), ("created_at", DESCENDING)]),  # Status queries sorted
+            IndexModel([("status", ASCENDING), ("updated_at", ASCENDING)]),  # Retention
+        ],
+        "time_slots": [
+            IndexModel("date"),
+            IndexModel("is_available"),
+            IndexModel("id", unique=True),
+            IndexModel([("is_available", ASCENDING), ("date", ASCENDING), ("start_time", ASCENDING), ("id", ASCENDING)]),
+            IndexModel([("date", ASCENDING), ("start_time", ASCENDING), ("id", ASCENDING)]),  # Chronological (keyset)
+        ],
+        "reviews": [
+            IndexModel("user_id"),
+            IndexModel("status"),
+            IndexModel("id", unique=True),
+            IndexModel([("status", ASCENDING), ("created_at", DESCENDING), ("id", DESCENDING)]),  # Approved reviews
+            IndexModel([("created_at", DESCENDING), ("id", DESCENDING)]),  # Admin panel sorting
+            IndexModel([("rating", DESCENDING), ("created_at", DESCENDING)]),
+            IndexModel([("status", ASCENDING), ("updated_at", ASCENDING)]),  # Retention
+        ],
+        # Expired codes are removed by the TTL monitor
+        "password_resets": [
+            IndexModel([("email", ASCENDING), ("code", ASCENDING)]),
+            IndexModel("expires_at", expireAfterSeconds=0),
+        ],
+        "appointments_archive": [IndexModel("id", unique=True)],
+        "reviews_archive": [IndexModel("id", unique=True)],
+        # Worker claims due jobs in order
+        "email_outbox": [
+            IndexModel("id", unique=True),
+            IndexModel([("status", ASCENDING), ("next_attempt_at", ASCENDING)]),
+            IndexModel([("status", ASCENDING), ("locked_until", ASCENDING)]),
+            IndexModel([("status", ASCENDING), ("digest_to", ASCENDING)], sparse=True),  # Admin digests
+            IndexModel("digest_parent", sparse=True),
+        ],
+    }),
+    Migration(2, "Backfill analytics daily rollups", run=rebuild_rollups),
+    Migration(3, "Backfill the materialized review summary", run=rebuild_review_summary),
+    Migration(4, "Embed client and slot snapshots in appointments", run=backfill_snapshots),
+    # The baseline non-unique index has the same key pattern and would conflict
+    Migration(5, "Deduplicate time slots and make (date, start_time) unique",
+              run=create_unique_slot_index, drop={"time_slots": ["date_1_start_time_1"]}),
+    # Cross-worker cache invalidations, read back by created_at and kept one hour
+    Migration(6, "Cache invalidation log", {
+        "cache_invalidations": [IndexModel("created_at", expireAfterSeconds=3600)],
+    }),
+    # Unredeemed SSE tickets are removed by the TTL monitor
+    Migration(7, "SSE ticket expiry", {
+        "sse_tickets": [IndexModel("expires_at", expireAfterSeconds=0)],
+    }),
+    # Created on every boot before migrations existed; migration 1 extends them with `id`
+    Migration(8, "Drop the baseline indexes replaced by migration 1", drop={
+        "appointments": ["created_at_-1", "user_id_1_created_at_-1"],
+        "time_slots": ["is_available_1_date_1"],  # date_1_start_time_1: migration 5
+        "reviews": ["status_1_created_at_-1", "created_at_-1"],
+    }),
+]
+
+
+async def applied_versions(db) -> List[int]:
+    docs = await db[MIGRATIONS_COLLECTION].find({"version": {"$exists": True}}, {"version": 1}).to_list(length=None)
+    return sorted(doc["version"] for doc in docs)
+
+
+def pending_migrations(applied: List[int]) -> List[Migration]:
+    return sorted((m for m in MIGRATIONS if m.version not in applied), key=lambda m: m.version)
+
+
+async def acquire_lock(db, owner: str) -> bool:
+    """Keep concurrent deploys from applying the same migrations twice."""
+    now = datetime.utcnow()
+    try:
+        await db[MIGRATIONS_COLLECTION].find_one_and_update(
+            {"_id": LOCK_ID, "$or": [{"expires_at": {"$lt": now}}, {"owner": owner}]},
+            {"$set": {"owner": owner, "expires_at": now + timedelta(seconds=MIGRATION_LOCK_SECONDS)}},
+            upsert=True
+        )
+        return True
+    except DuplicateKeyError:
+        return False
+
+
+async def release_lock(db, owner: str):
+    await db[MIGRATIONS_COLLECTION].delete_one({"_id": LOCK_ID, "owner": owner})
+
+
+async def migrate(db) -> List[int]:
+    """Apply pending migrations in version order. Returns the versions applied."""
+    owner = f"{socket.gethostname()}:{os.getpid()}"
+    if not await acquire_lock(db, owner):
+        raise RuntimeError("Another migration run holds the lock")
+    applied = []
+    try:
+        for migration in pending_migrations(await applied_versions(db)):
+            logger.info(f"Applying migration {migration.version}: {migration.description}")
+            await migration.apply(db)
+            await db[MIGRATIONS_COLLECTION].insert_one({
+                "_id": f"v{migration.version}",
+                "version": migration.version,
+                "description": migration.description,
+                "applied_at": datetime.utcnow(),
+            })
+            applied.append(migration.version)
+    finally:
+        await release_lock(db, owner)
+    return applied
+
+
+async def run(status_only: bool):
+    db = await get_database()
+    try:
+        if status_only:
+            applied = await applied_versions(db)
+            for migration in sorted(MIGRATIONS, key=lambda m: m.version):
+                state = "applied" if migration.version in applied else "pending"
+                print(f"{migration.version:>4}  {state:<8} {migration.description}")
+            return
+        applied = await migrate(db)
+        logger.info(f"Migrations applied: {applied}" if applied else "Database schema is up to date")
+    finally:
+        await close_db_connection()
+
+
+def main():
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description="Apply database index migrations")
+    parser.add_argument("--status", action="store_true", help="list migrations without applying them")
+    args = parser.parse_args()
+    asyncio.run(run(args.status))
+
+
+if __name__ == "__main__":
+    main()
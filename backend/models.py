@@ -1,6 +1,6 @@
 from pydantic import BaseModel, Field, EmailStr
-from typing import List, Optional
-from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+from datetime import date, datetime, timedelta
 from enum import Enum
 import uuid
 
@@ -19,6 +19,11 @@ class ReviewStatus(str, Enum):
     APPROVED = "approved"
     REJECTED = "rejected"
 
+# Notification preferences (admins)
+class NotificationPreferences(BaseModel):
+    appointment_notification: bool = True
+    review_notification: bool = True
+
 # User Models
 class User(BaseModel):
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
@@ -29,6 +34,7 @@ class User(BaseModel):
     phone: Optional[str] = None
     role: UserRole = UserRole.CLIENT
     is_active: bool = True
+    notification_preferences: NotificationPreferences = Field(default_factory=NotificationPreferences)
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
 
@@ -51,6 +57,7 @@ class UserResponse(BaseModel):
     phone: Optional[str] = None
     role: UserRole
     is_active: bool
+    notification_preferences: Optional[NotificationPreferences] = None
     created_at: datetime
 
 # Slot Models (Time slots that admin creates)
@@ -70,6 +77,18 @@ class TimeSlotCreate(BaseModel):
     date: datetime
     time: str  # Une seule heure (ex: "14:00") - durée fixe 1h
 
+class TimeSlotBulkCreate(BaseModel):
+    """Recurring schedule expanded server-side into one-hour slots."""
+    start_date: date
+    end_date: date
+    weekdays: List[int] = Field(default_factory=lambda: list(range(7)))  # 0 = lundi ... 6 = dimanche
+    times: List[str]  # Heures de début (ex: ["09:00", "14:00"])
+    exclusions: List[date] = []  # Jours fermés
+
+class TimeSlotBulkResult(BaseModel):
+    created: int
+    skipped: int
+
 class TimeSlotResponse(BaseModel):
     id: str
     date: datetime
@@ -81,6 +100,14 @@ class TimeSlotResponse(BaseModel):
     is_available: bool
     created_at: datetime
 
+class DayAvailability(BaseModel):
+    date: date
+    available: int
+
+class AvailabilitySummary(BaseModel):
+    days: List[DayAvailability]
+    slots: Optional[List[TimeSlotResponse]] = None  # Créneaux du jour demandé (drill-down)
+
 # Appointment Models
 class Appointment(BaseModel):
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
@@ -92,6 +119,10 @@ class Appointment(BaseModel):
     notes: Optional[str] = None
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
+    # Instantanés dénormalisés (voir snapshots.py)
+    user_name: Optional[str] = None
+    user_email: Optional[str] = None
+    slot_info: Optional[dict] = None
 
 class AppointmentCreate(BaseModel):
     slot_id: str
@@ -145,6 +176,49 @@ class ReviewResponse(BaseModel):
     # Populated fields
     user_name: Optional[str] = None
 
+class ReviewSummary(BaseModel):
+    count: int
+    average: Optional[float] = None
+    histogram: Dict[str, int]  # "1".."5" -> nombre d'avis approuvés
+
+# Admin Dashboard Models
+class DashboardSummary(BaseModel):
+    pending_appointments: int
+    pending_reviews: int
+    free_slots_this_week: int
+
+class AdminDashboard(BaseModel):
+    summary: DashboardSummary
+    appointments: List[AppointmentResponse]
+    slots: List[TimeSlotResponse]
+    reviews: List[ReviewResponse]
+    # Curseurs de la page suivante de chaque liste (None = dernière page)
+    next_cursors: Dict[str, Optional[str]]
+
+# Admin Statistics Models
+class StatsGrouping(str, Enum):
+    DAY = "day"
+    WEEK = "week"
+    MONTH = "month"
+
+class StatsPeriod(BaseModel):
+    period: str  # YYYY-MM-DD (jour, lundi de la semaine), YYYY-MM (mois) ou "total"
+    bookings: int
+    by_status: Dict[str, int]
+    revenue: float  # Rendez-vous confirmés et terminés
+    reviews_approved: int
+    average_rating: Optional[float] = None
+    slots_total: int
+    slots_booked: int
+    occupancy_rate: Optional[float] = None
+
+class AdminStats(BaseModel):
+    start_date: date
+    end_date: date
+    group_by: StatsGrouping
+    periods: List[StatsPeriod]
+    totals: StatsPeriod
+
 # JWT Token Models
 class Token(BaseModel):
     access_token: str
@@ -153,6 +227,11 @@ class Token(BaseModel):
 class TokenData(BaseModel):
     email: Optional[str] = None
 
+class EventTicket(BaseModel):
+    """Single-use ticket for GET /api/events (EventSource cannot send headers)."""
+    ticket: str
+    expires_in: int  # seconds
+
 # Status Check (keeping existing)
 class StatusCheck(BaseModel):
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
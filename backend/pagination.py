@@ -0,0 +1,62 @@
+import base64
+from typing import List, Optional, Sequence, Tuple
+
+from bson import json_util
+from fastapi import HTTPException, Response, status
+
+# Header carrying the cursor of the next page (absent on the last page)
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+# Sort keys used for keyset pagination - `id` breaks ties on equal timestamps
+SLOT_SORT: Sequence[Tuple[str, int]] = (("date", 1), ("start_time", 1), ("id", 1))
+APPOINTMENT_SORT: Sequence[Tuple[str, int]] = (("created_at", -1), ("id", -1))
+REVIEW_SORT: Sequence[Tuple[str, int]] = (("created_at", -1), ("id", -1))
+
+
+def encode_cursor(doc: dict, sort: Sequence[Tuple[str, int]]) -> str:
+    """Build an opaque cursor from the sort key values of the last document."""
+    values = [doc.get(field) for field, _ in sort]
+    return base64.urlsafe_b64encode(json_util.dumps(values).encode()).decode()
+
+
+def decode_cursor(cursor: str, sort: Sequence[Tuple[str, int]]) -> list:
+    try:
+        values = json_util.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except Exception:
+        values = None
+    if not isinstance(values, list) or len(values) != len(sort):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+    return values
+
+
+def keyset_filter(cursor: Optional[str], sort: Sequence[Tuple[str, int]]) -> dict:
+    """Mongo filter selecting the documents that come after `cursor` in `sort` order."""
+    if not cursor:
+        return {}
+    values = decode_cursor(cursor, sort)
+    clauses = []
+    for i, (field, direction) in enumerate(sort):
+        clause = {sort[j][0]: values[j] for j in range(i)}
+        clause[field] = {"$gt" if direction == 1 else "$lt": values[i]}
+        clauses.append(clause)
+    return {"$or": clauses}
+
+
+def next_cursor(docs: List[dict], limit: int, sort: Sequence[Tuple[str, int]]) -> Optional[str]:
+    """Cursor of the next page, or None when this page is the last one."""
+    if docs and len(docs) >= limit:
+        return encode_cursor(docs[-1], sort)
+    return None
+
+
+def set_next_cursor(response: Response, docs: List[dict], limit: int, sort: Sequence[Tuple[str, int]]):
+    """Expose the next page cursor when the page is full."""
+    cursor = next_cursor(docs, limit, sort)
+    if cursor:
+        response.headers[NEXT_CURSOR_HEADER] = cursor
+
+
+def next_cursor_headers(response: Response) -> dict:
+    """Headers to replay when the response is cached."""
+    cursor = response.headers.get(NEXT_CURSOR_HEADER)
+    return {NEXT_CURSOR_HEADER: cursor} if cursor else {}
@@ -0,0 +1,68 @@
+from typing import List, Optional
+
+# Champs nécessaires aux réponses - jamais password_hash ni _id
+USER_FIELDS = {"_id": 0, "first_name": 1, "last_name": 1, "email": 1}
+SLOT_FIELDS = {
+    "_id": 0,
+    "id": 1,
+    "date": 1,
+    "start_time": 1,
+    "end_time": 1,
+    "service_name": 1,
+    "service_duration": 1,
+    "price": 1,
+    "is_available": 1,
+    "created_at": 1,
+}
+
+LOOKUP_USER = {
+    "$lookup": {
+        "from": "users",
+        "localField": "user_id",
+        "foreignField": "id",
+        "pipeline": [{"$project": USER_FIELDS}],
+        "as": "user_info"
+    }
+}
+
+LOOKUP_SLOT = {
+    "$lookup": {
+        "from": "time_slots",
+        "localField": "slot_id",
+        "foreignField": "id",
+        "pipeline": [{"$project": SLOT_FIELDS}],
+        "as": "slot_info"
+    }
+}
+
+USER_NAME = {
+    "$concat": [
+        {"$arrayElemAt": ["$user_info.first_name", 0]},
+        " ",
+        {"$arrayElemAt": ["$user_info.last_name", 0]}
+    ]
+}
+
+# Les rendez-vous portent un instantané du client et du créneau (voir snapshots.py) :
+# aucune jointure à la lecture
+APPOINTMENT_PROJECTION = {"_id": 0}
+# Vue client : sans les champs client
+CLIENT_APPOINTMENT_PROJECTION = {"_id": 0, "user_name": 0, "user_email": 0}
+
+REVIEW_ENRICHMENT = [
+    LOOKUP_USER,
+    {"$addFields": {"user_name": USER_NAME}},
+    {"$project": {"_id": 0, "user_info": 0}}
+]
+
+
+def appointment_pipeline(match: Optional[dict] = None, page: Optional[List[dict]] = None,
+                         with_user: bool = True) -> List[dict]:
+    """Build an appointment query: filter, paginate, then project the embedded snapshots."""
+    stages: List[dict] = []
+    if match:
+        stages.append({"$match": match})
+    if page:
+        stages.extend(page)
+    stages.append({"$project": APPOINTMENT_PROJECTION if with_user else CLIENT_APPOINTMENT_PROJECTION})
+    return stages
@@ -0,0 +1,165 @@
+import os
+import threading
+import time
+from typing import Dict, List, Optional
+
+from pymongo import monitoring
+
+from metrics import CHECKOUT_WAIT_BUCKETS, Counter, Gauge, Histogram, Metric
+
+
+def _optional_int(name: str) -> Optional[int]:
+    value = os.environ.get(name)
+    return int(value) if value else None
+
+
+# Réglages du pool Motor (None = valeur par défaut de PyMongo)
+MONGO_POOL_SETTINGS: Dict[str, Optional[int]] = {
+    "maxPoolSize": int(os.environ.get("MONGO_MAX_POOL_SIZE", "100")),  # Per worker process
+    "minPoolSize": int(os.environ.get("MONGO_MIN_POOL_SIZE", "0")),
+    "maxIdleTimeMS": _optional_int("MONGO_MAX_IDLE_TIME_MS"),
+    "waitQueueTimeoutMS": _optional_int("MONGO_WAIT_QUEUE_TIMEOUT_MS"),  # Fail fast instead of queueing forever
+    "serverSelectionTimeoutMS": int(os.environ.get("MONGO_SERVER_SELECTION_TIMEOUT_MS", "5000")),
+    "connectTimeoutMS": int(os.environ.get("MONGO_CONNECT_TIMEOUT_MS", "10000")),
+    "socketTimeoutMS": _optional_int("MONGO_SOCKET_TIMEOUT_MS"),
+}
+
+
+def mongo_client_options() -> dict:
+    """Keyword arguments for AsyncIOMotorClient, without the unset options."""
+    return {name: value for name, value in MONGO_POOL_SETTINGS.items() if value is not None}
+
+
+class PoolMetrics(monitoring.ConnectionPoolListener):
+    """CMAP listener: checkout waits, pool saturation and connection churn.
+
+    PyMongo emits these events synchronously on the thread performing the checkout
+    (a Motor executor thread), so a checkout's start time is kept in a thread-local.
+    """
+
+    def __init__(self, max_pool_size: int = MONGO_POOL_SETTINGS["maxPoolSize"]):
+        self.max_pool_size = max_pool_size
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.checkout_failures: Dict[str, int] = {}
+        self.wait_buckets = [0] * (len(CHECKOUT_WAIT_BUCKETS) + 1)  # Last one is +Inf
+        self.wait_sum = 0.0
+        self.wait_max = 0.0
+        self.in_use = 0
+        self.in_use_peak = 0
+        self.open_connections = 0
+        self.connections_created = 0
+        self.connections_closed = 0
+        self.connections_closed_by_reason: Dict[str, int] = {}
+        self.pool_clears = 0
+
+    def _record_wait(self) -> float:
+        started = getattr(self._local, "checkout_started", None)
+        self._local.checkout_started = None
+        return time.perf_counter() - started if started is not None else 0.0
+
+    def connection_check_out_started(self, event):
+        self._local.checkout_started = time.perf_counter()
+
+    def connection_checked_out(self, event):
+        wait = self._record_wait()
+        bucket = len(CHECKOUT_WAIT_BUCKETS)
+        for i, bound in enumerate(CHECKOUT_WAIT_BUCKETS):
+            if wait <= bound:
+                bucket = i
+                break
+        with self._lock:
+            self.checkouts += 1
+            self.wait_buckets[bucket] += 1
+            self.wait_sum += wait
+            self.wait_max = max(self.wait_max, wait)
+            self.in_use += 1
+            self.in_use_peak = max(self.in_use_peak, self.in_use)
+
+    def connection_check_out_failed(self, event):
+        self._record_wait()
+        with self._lock:
+            self.checkout_failures[event.reason] = self.checkout_failures.get(event.reason, 0) + 1
+
+    def connection_checked_in(self, event):
+        with self._lock:
+            self.in_use -= 1
+
+    def connection_created(self, event):
+        with self._lock:
+            self.connections_created += 1
+            self.open_connections += 1
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        with self._lock:
+            self.connections_closed += 1
+            self.open_connections -= 1
+            self.connections_closed_by_reason[event.reason] = self.connections_closed_by_reason.get(event.reason, 0) + 1
+
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        with self._lock:
+            self.pool_clears += 1
+
+    def pool_closed(self, event):
+        pass
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "settings": mongo_client_options(),
+                "checkouts": self.checkouts,
+                "checkout_failures": dict(self.checkout_failures),
+                "checkout_wait": {
+                    "buckets": dict(zip([*map(str, CHECKOUT_WAIT_BUCKETS), "+Inf"], self.wait_buckets)),
+                    "sum_seconds": round(self.wait_sum, 6),
+                    "max_seconds": round(self.wait_max, 6),
+                    "avg_seconds": round(self.wait_sum / self.checkouts, 6) if self.checkouts else 0.0,
+                },
+                "in_use": self.in_use,
+                "in_use_peak": self.in_use_peak,
+                "saturation": round(self.in_use / self.max_pool_size, 4) if self.max_pool_size else None,
+                "open_connections": self.open_connections,
+                "connections_created": self.connections_created,
+                "connections_closed": dict(self.connections_closed_by_reason),
+                "pool_clears": self.pool_clears,
+            }
+
+    def prometheus_metrics(self) -> List[Metric]:
+        """Current values as metric families (registered as a scrape-time collector)."""
+        with self._lock:
+            wait = Histogram("mongodb_pool_checkout_wait_seconds", "Time spent waiting for a pooled connection.",
+                             buckets=CHECKOUT_WAIT_BUCKETS)
+            child = wait.labels()
+            child.counts = list(self.wait_buckets)
+            child.sum = self.wait_sum
+            failures = Counter("mongodb_pool_checkout_failures_total", "Failed checkouts by reason.", ("reason",))
+            for reason, count in self.checkout_failures.items():
+                failures.labels(reason).set(count)
+            in_use = Gauge("mongodb_pool_connections_in_use", "Connections checked out.")
+            in_use.labels().set(self.in_use)
+            open_connections = Gauge("mongodb_pool_connections_open", "Open pooled connections.")
+            open_connections.labels().set(self.open_connections)
+            max_size = Gauge("mongodb_pool_max_size", "Configured maxPoolSize.")
+            max_size.labels().set(self.max_pool_size)
+            created = Counter("mongodb_pool_connections_created_total", "Connections opened.")
+            created.labels().set(self.connections_created)
+            closed = Counter("mongodb_pool_connections_closed_total", "Connections closed by reason.", ("reason",))
+            for reason, count in self.connections_closed_by_reason.items():
+                closed.labels(reason).set(count)
+            clears = Counter("mongodb_pool_clears_total", "Pool clears after network errors.")
+            clears.labels().set(self.pool_clears)
+        return [wait, failures, in_use, open_connections, max_size, created, closed, clears]
+
+
+# Global listener, registered on the Motor client of each process
+pool_metrics = PoolMetrics()
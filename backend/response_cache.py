@@ -0,0 +1,67 @@
+import hashlib
+import os
+from typing import Dict, Optional
+
+from fastapi import Request, Response
+
+from ttl_cache import TTLCache
+
+# Cache des réponses publiques
+RESPONSE_CACHE_TTL = float(os.environ.get("RESPONSE_CACHE_TTL", "30"))  # Bounds staleness if an invalidation is lost
+RESPONSE_CACHE_SIZE = int(os.environ.get("RESPONSE_CACHE_SIZE", "256"))
+
+# Namespaces, invalidated by the matching write paths
+PUBLIC_SLOTS = "public_slots"
+PUBLIC_REVIEWS = "public_reviews"
+
+
+class CachedResponse:
+    __slots__ = ("body", "etag", "headers")
+
+    def __init__(self, body: bytes, headers: Dict[str, str]):
+        self.body = body
+        self.etag = f'"{hashlib.sha1(body).hexdigest()}"'
+        self.headers = {**headers, "ETag": self.etag}
+
+
+class ResponseCache(TTLCache):
+    """Serialized JSON responses of public read endpoints, keyed by path and query string."""
+
+    def __init__(self, ttl: float = RESPONSE_CACHE_TTL, maxsize: int = RESPONSE_CACHE_SIZE):
+        super().__init__(maxsize, ttl)
+        self._generations: Dict[str, int] = {}  # Bumped by every invalidation
+
+    def key(self, namespace: str, request: Request) -> tuple:
+        """Cache key, taken before querying: it carries the namespace generation."""
+        return (namespace, self._generations.get(namespace, 0),
+                request.url.path, tuple(sorted(request.query_params.multi_items())))
+
+    def store(self, key: tuple, body: bytes, headers: Optional[Dict[str, str]] = None) -> CachedResponse:
+        """Keep the serialized JSON body with its ETag.
+
+        Not cached when the namespace was invalidated since `key` was taken: the body
+        may have been read before the write that triggered the invalidation.
+        """
+        entry = CachedResponse(body, headers or {})
+        namespace, generation = key[0], key[1]
+        if generation == self._generations.get(namespace, 0):
+            self.set(key, entry)
+        return entry
+
+    def invalidate(self, namespace: str):
+        self._generations[namespace] = self._generations.get(namespace, 0) + 1
+        for key in self.keys():
+            if key[0] == namespace:
+                self.pop(key)
+
+
+def cached_response(request: Request, entry: CachedResponse) -> Response:
+    """Answer from the cache, with 304 when the client already has this version."""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and entry.etag in [tag.strip() for tag in if_none_match.split(",")]:
+        return Response(status_code=304, headers={"ETag": entry.etag})
+    return Response(content=entry.body, media_type="application/json", headers=entry.headers)
+
+
+# Global response cache instance
+response_cache = ResponseCache()
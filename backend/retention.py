@@ -0,0 +1,89 @@
+"""Data retention: moves old documents into archive collections.
+
+Usage (from the backend directory, e.g. as a daily cron job):
+    python -m retention
+"""
+import asyncio
+import logging
+import os
+from datetime import datetime, timedelta
+from typing import Callable, List
+
+from pymongo.errors import BulkWriteError
+
+from database import close_db_connection, get_database
+
+logger = logging.getLogger("retention")
+
+RETENTION_BATCH_SIZE = int(os.environ.get("RETENTION_BATCH_SIZE", "500"))
+APPOINTMENT_RETENTION_DAYS = int(os.environ.get("APPOINTMENT_RETENTION_DAYS", "365"))
+REJECTED_REVIEW_RETENTION_DAYS = int(os.environ.get("REJECTED_REVIEW_RETENTION_DAYS", "90"))
+
+
+class RetentionPolicy:
+    """Documents of `collection` matching `query(cutoff)` move to `archive_collection`."""
+
+    def __init__(self, name: str, collection: str, archive_collection: str,
+                 max_age_days: int, query: Callable[[datetime], dict]):
+        self.name = name
+        self.collection = collection
+        self.archive_collection = archive_collection
+        self.max_age_days = max_age_days
+        self.query = query
+
+
+RETENTION_POLICIES: List[RetentionPolicy] = [
+    RetentionPolicy(
+        "closed_appointments", "appointments", "appointments_archive", APPOINTMENT_RETENTION_DAYS,
+        lambda cutoff: {"status": {"$in": ["cancelled", "completed"]}, "updated_at": {"$lt": cutoff}}
+    ),
+    RetentionPolicy(
+        "rejected_reviews", "reviews", "reviews_archive", REJECTED_REVIEW_RETENTION_DAYS,
+        lambda cutoff: {"status": "rejected", "updated_at": {"$lt": cutoff}}
+    ),
+]
+
+
+def register_policy(policy: RetentionPolicy):
+    """Add a retention policy (applied by the next run)."""
+    RETENTION_POLICIES.append(policy)
+
+
+async def apply_policy(db, policy: RetentionPolicy, batch_size: int = RETENTION_BATCH_SIZE) -> int:
+    """Archive matching documents in batches. Returns the number of documents moved."""
+    query = policy.query(datetime.utcnow() - timedelta(days=policy.max_age_days))
+    moved = 0
+    while True:
+        docs = await db[policy.collection].find(query).limit(batch_size).to_list(length=batch_size)
+        if not docs:
+            return moved
+        archived_at = datetime.utcnow()
+        for doc in docs:
+            doc["archived_at"] = archived_at
+        try:
+            await db[policy.archive_collection].insert_many(docs, ordered=False)
+        except BulkWriteError as e:
+            # Already archived by an interrupted run
+            if any(error.get("code") != 11000 for error in e.details.get("writeErrors", [])):
+                raise
+        await db[policy.collection].delete_many({"_id": {"$in": [doc["_id"] for doc in docs]}})
+        moved += len(docs)
+
+
+async def run_retention():
+    db = await get_database()
+    try:
+        for policy in RETENTION_POLICIES:
+            moved = await apply_policy(db, policy)
+            logger.info(f"Retention {policy.name}: {moved} documents archived to {policy.archive_collection}")
+    finally:
+        await close_db_connection()
+
+
+def main():
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(run_retention())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+import logging
+from typing import Optional
+
+from pymongo.errors import PyMongoError
+
+logger = logging.getLogger(__name__)
+
+# Résumé matérialisé des avis approuvés (un seul document)
+REVIEW_SUMMARY_COLLECTION = "review_summary"
+REVIEW_SUMMARY_ID = "approved"
+RATINGS = range(1, 6)
+
+
+def _is_approved(status) -> bool:
+    return getattr(status, "value", status) == "approved"
+
+
+def summary_from_doc(doc: Optional[dict]) -> dict:
+    """Count, mean and 1-5 histogram from the stored counters."""
+    doc = doc or {}
+    count = doc.get("count", 0)
+    histogram = doc.get("histogram") or {}
+    return {
+        "count": count,
+        "average": round(doc.get("sum", 0) / count, 2) if count else None,
+        "histogram": {str(rating): histogram.get(str(rating), 0) for rating in RATINGS},
+    }
+
+
+async def apply_review_transition(db, review: dict, new_status):
+    """`$inc` the summary when a review moves into or out of `approved`."""
+    was_approved = _is_approved(review.get("status"))
+    is_approved = _is_approved(new_status)
+    if was_approved == is_approved:
+        return
+    sign = 1 if is_approved else -1
+    rating = review.get("rating", 0)
+    try:
+        await db[REVIEW_SUMMARY_COLLECTION].update_one(
+            {"_id": REVIEW_SUMMARY_ID},
+            {"$inc": {"count": sign, "sum": sign * rating, f"histogram.{rating}": sign}},
+            upsert=True
+        )
+    except PyMongoError as e:
+        logger.warning(f"Review summary update failed: {e}")
+
+
+async def get_review_summary(db) -> dict:
+    return summary_from_doc(await db[REVIEW_SUMMARY_COLLECTION].find_one({"_id": REVIEW_SUMMARY_ID}))
+
+
+async def rebuild_review_summary(db):
+    """Recompute the summary from the approved reviews (backfill)."""
+    rows = await db.reviews.aggregate([
+        {"$match": {"status": "approved"}},
+        {"$group": {"_id": "$rating", "count": {"$sum": 1}}}
+    ]).to_list(length=None)
+    histogram = {str(row["_id"]): row["count"] for row in rows}
+    await db[REVIEW_SUMMARY_COLLECTION].replace_one(
+        {"_id": REVIEW_SUMMARY_ID},
+        {
+            "count": sum(row["count"] for row in rows),
+            "sum": sum(row["_id"] * row["count"] for row in rows),
+            "histogram": histogram,
+        },
+        upsert=True
+    )
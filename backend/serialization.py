@@ -0,0 +1,40 @@
+from typing import Dict, List, Optional, Type
+
+from fastapi import Response
+from pydantic import BaseModel, TypeAdapter
+
+from models import AdminDashboard, AppointmentResponse, ReviewResponse, TimeSlotResponse
+
+
+class ListSerializer:
+    """Validate and JSON-encode a list of Mongo documents in one pydantic-core pass.
+
+    The schema is compiled once; list endpoints return the bytes directly so
+    FastAPI does not validate and encode every item a second time.
+    """
+
+    def __init__(self, model: Type[BaseModel]):
+        self._adapter = TypeAdapter(List[model])
+
+    def dump(self, docs: List[dict]) -> bytes:
+        return self._adapter.dump_json(self._adapter.validate_python(docs))
+
+
+class ModelSerializer:
+    """Same as ListSerializer, for a single response document."""
+
+    def __init__(self, model: Type[BaseModel]):
+        self._adapter = TypeAdapter(model)
+
+    def dump(self, doc: dict) -> bytes:
+        return self._adapter.dump_json(self._adapter.validate_python(doc))
+
+
+def json_response(body: bytes, headers: Optional[Dict[str, str]] = None) -> Response:
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+slot_list_serializer = ListSerializer(TimeSlotResponse)
+appointment_list_serializer = ListSerializer(AppointmentResponse)
+review_list_serializer = ListSerializer(ReviewResponse)
+dashboard_serializer = ModelSerializer(AdminDashboard)
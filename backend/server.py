@@ -1,7 +1,11 @@
-from fastapi import FastAPI, APIRouter, Depends, HTTPException, status, Header, BackgroundTasks
+from fastapi import FastAPI, APIRouter, Depends, HTTPException, status, Header, Request, Response
+from fastapi.responses import StreamingResponse
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from starlette.middleware.cors import CORSMiddleware
+from pymongo import ReturnDocument
+from pymongo.errors import BulkWriteError, DuplicateKeyError, PyMongoError
 from datetime import timedelta
+import asyncio
 import os
 import logging
 from pathlib import Path
@@ -13,76 +17,24 @@ import string
 # Local imports
 from models import *
 from auth import *
-from database import get_database, create_indexes, close_db_connection
-from email_service import email_service
-
-# Background task for sending emails asynchronously
-async def send_appointment_notification_background(
-    admin_emails: list,
-    user_name: str,
-    user_email: str,
-    service_name: str,
-    appointment_date: str,
-    appointment_time: str
-):
-    """Send appointment notification email in background - non-blocking"""
-    try:
-        for admin_email in admin_emails:
-            await email_service.send_appointment_notification(
-                admin_email=admin_email,
-                user_name=user_name,
-                user_email=user_email,
-                service_name=service_name,
-                appointment_date=appointment_date,
-                appointment_time=appointment_time
-            )
-        logging.info(f"Background email notification sent for appointment: {user_name} - {service_name}")
-    except Exception as e:
-        logging.error(f"Background email notification failed: {str(e)}")
-        # Don't re-raise - background task failures shouldn't affect API response
-
-async def send_appointment_cancellation_background(
-    client_email: str,
-    client_name: str,
-    service_name: str,
-    appointment_date: str,
-    appointment_time: str,
-    service_price: float
-):
-    """Send appointment cancellation email in background - non-blocking"""
-    try:
-        await email_service.send_appointment_cancellation_to_client(
-            client_email=client_email,
-            client_name=client_name,
-            service_name=service_name,
-            appointment_date=appointment_date,
-            appointment_time=appointment_time,
-            service_price=service_price
-        )
-        logging.info(f"Background cancellation email sent to: {client_email} - {service_name}")
-    except Exception as e:
-        logging.error(f"Background cancellation email failed: {str(e)}")
-        # Don't re-raise - background task failures shouldn't affect API response
-
-async def send_review_notification_background(
-    admin_emails: list,
-    user_name: str,
-    rating: int,
-    comment: str
-):
-    """Send review notification email to admins in background - non-blocking"""
-    try:
-        for admin_email in admin_emails:
-            await email_service.send_review_notification(
-                admin_email=admin_email,
-                user_name=user_name,
-                rating=rating,
-                comment=comment
-            )
-        logging.info(f"Background review notification sent for: {user_name} - {rating} stars")
-    except Exception as e:
-        logging.error(f"Background review notification failed: {str(e)}")
-        # Don't re-raise - background task failures shouldn't affect API response
+from database import get_database, close_db_connection
+from pool_metrics import pool_metrics
+from analytics import (
+    get_stats, record_appointment_deleted, record_appointment_status, record_booking,
+    record_review_status, record_slot_deleted, record_slot_released, record_slots_created
+)
+from live_events import SSE_TICKET_TTL_SECONDS, event_broker, issue_ticket, redeem_ticket
+from review_summary import apply_review_transition, get_review_summary
+from snapshots import slot_snapshot, user_snapshot
+from metrics import METRICS_CONTENT_TYPE, PrometheusMiddleware, bookings_total, cache_collector, gauge_collector, registry
+from email_queue import enqueue_email, enqueue_emails
+from admin_recipients import admin_recipients
+from maintenance import maintenance_cache, MAINTENANCE_DOC_ID
+from pipelines import REVIEW_ENRICHMENT, appointment_pipeline
+from response_cache import PUBLIC_REVIEWS, PUBLIC_SLOTS, cached_response, response_cache
+from cache_invalidation import ADMIN_RECIPIENTS, MAINTENANCE, USERS, cache_invalidator
+from serialization import appointment_list_serializer, dashboard_serializer, json_response, review_list_serializer, slot_list_serializer
+from pagination import APPOINTMENT_SORT, REVIEW_SORT, SLOT_SORT, keyset_filter, next_cursor, next_cursor_headers, set_next_cursor
 
 ROOT_DIR = Path(__file__).parent
 
@@ -147,7 +99,7 @@ async def register(user_data: UserCreate, db = Depends(get_db)):
         )
     
     # Hash password and create user
-    password_hash = get_password_hash(user_data.password)
+    password_hash = await get_password_hash_async(user_data.password)
     user = User(
         email=user_data.email,
         password_hash=password_hash,
@@ -174,7 +126,7 @@ async def login(user_credentials: UserLogin, db = Depends(get_db)):
         )
     
     # Verify password
-    if not verify_password(user_credentials.password, user_data["password_hash"]):
+    if not await verify_password_async(user_credentials.password, user_data["password_hash"]):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid email or password"
@@ -194,59 +146,229 @@ async def get_current_user_info(
     """Get current user information."""
     return current_user
 
+@api_router.put("/me/notifications", response_model=NotificationPreferences)
+async def update_notification_preferences(
+    preferences: NotificationPreferences,
+    current_user: User = Depends(get_current_admin_user_with_db),
+    db = Depends(get_db)
+):
+    """Opt in or out of admin notification emails (Admin only)."""
+    await db.users.update_one(
+        {"id": current_user.id},
+        {"$set": {"notification_preferences": preferences.model_dump(), "updated_at": datetime.utcnow()}}
+    )
+    await cache_invalidator.publish(db, USERS, current_user.email)
+    await cache_invalidator.publish(db, ADMIN_RECIPIENTS)
+    return preferences
+
 # ==========================================
 # TIME SLOT ROUTES (Admin Only)
 # ==========================================
 
-@api_router.post("/slots", response_model=TimeSlotResponse)
-async def create_time_slot(
-    slot_data: TimeSlotCreate,
-    current_user: User = Depends(get_current_admin_user_with_db),
-    db = Depends(get_db)
-):
-    """Create a new time slot (Admin only)."""
-    
+# Limite d'une création en masse
+MAX_BULK_SLOTS = 2000
+
+def build_time_slot(slot_date: datetime, start_time: str, created_by: str) -> TimeSlot:
+    """Build a one-hour slot starting at `start_time` (HH:MM)."""
     # Calculer end_time basé sur start_time + 1 heure fixe
     try:
-        from datetime import datetime, timedelta
-        start_time_obj = datetime.strptime(slot_data.time, "%H:%M")
-        end_time_obj = start_time_obj + timedelta(hours=1)  # Durée fixe 1 heure
-        end_time_str = end_time_obj.strftime("%H:%M")
+        start_time_obj = datetime.strptime(start_time, "%H:%M")
     except ValueError:
         raise HTTPException(status_code=400, detail="Invalid time format. Use HH:MM")
+    end_time_obj = start_time_obj + timedelta(hours=1)  # Durée fixe 1 heure
     
-    slot = TimeSlot(
-        date=slot_data.date,
-        start_time=slot_data.time,
-        end_time=end_time_str,
+    return TimeSlot(
+        date=slot_date,
+        start_time=start_time,
+        end_time=end_time_obj.strftime("%H:%M"),
         service_name="HennaLash",  # Service par défaut
         service_duration=60,  # 1 heure
         price=15.0,  # Prix par défaut
-        created_by=current_user.id
+        created_by=created_by
     )
+
+@api_router.post("/slots", response_model=TimeSlotResponse)
+async def create_time_slot(
+    slot_data: TimeSlotCreate,
+    current_user: User = Depends(get_current_admin_user_with_db),
+    db = Depends(get_db)
+):
+    """Create a new time slot (Admin only)."""
+    slot = build_time_slot(slot_data.date, slot_data.time, current_user.id)
     
     slot_dict = slot.model_dump()
-    await db.time_slots.insert_one(slot_dict)
+    try:
+        await db.time_slots.insert_one(slot_dict)
+    except DuplicateKeyError:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="A time slot already exists at this date and time"
+        )
+    await cache_invalidator.publish(db, PUBLIC_SLOTS)
+    await record_slots_created(db, [slot_dict])
     
     return TimeSlotResponse(**slot_dict)
 
+@api_router.post("/slots/bulk", response_model=TimeSlotBulkResult)
+async def create_time_slots_bulk(
+    schedule: TimeSlotBulkCreate,
+    current_user: User = Depends(get_current_admin_user_with_db),
+    db = Depends(get_db)
+):
+    """Create the slots of a recurring schedule in one request (Admin only).
+    
+    Slots that already exist for the same date and start time are skipped.
+    """
+    if schedule.end_date < schedule.start_date:
+        raise HTTPException(status_code=400, detail="end_date must be after start_date")
+    if any(weekday < 0 or weekday > 6 for weekday in schedule.weekdays):
+        raise HTTPException(status_code=400, detail="weekdays must be between 0 (Monday) and 6 (Sunday)")
+    
+    # Expand the recurrence
+    weekdays = set(schedule.weekdays)
+    exclusions = set(schedule.exclusions)
+    times = sorted(set(schedule.times))
+    requested = []
+    day = schedule.start_date
+    while day <= schedule.end_date:
+        if day.weekday() in weekdays and day not in exclusions:
+            slot_date = datetime.combine(day, datetime.min.time())
+            requested.extend((slot_date, start_time) for start_time in times)
+        day += timedelta(days=1)
+    
+    if len(requested) > MAX_BULK_SLOTS:
+        raise HTTPException(status_code=400, detail=f"Too many slots (max {MAX_BULK_SLOTS})")
+    
+    # Existing slots in the range, skipped up front
+    existing_cursor = db.time_slots.find(
+        {
+            "date": {
+                "$gte": datetime.combine(schedule.start_date, datetime.min.time()),
+                "$lte": datetime.combine(schedule.end_date, datetime.min.time())
+            },
+            "start_time": {"$in": times}
+        },
+        {"_id": 0, "date": 1, "start_time": 1}
+    )
+    existing = {(slot["date"], slot["start_time"]) async for slot in existing_cursor}
+    
+    new_slots = [
+        build_time_slot(slot_date, start_time, current_user.id).model_dump()
+        for slot_date, start_time in requested
+        if (slot_date, start_time) not in existing
+    ]
+    
+    created = 0
+    if new_slots:
+        inserted = new_slots
+        try:
+            await db.time_slots.insert_many(new_slots, ordered=False)
+        except BulkWriteError as e:
+            # Created concurrently since the read - rejected by the unique (date, start_time) index
+            write_errors = e.details.get("writeErrors", [])
+            if any(error.get("code") != 11000 for error in write_errors):
+                raise
+            failed = {error["index"] for error in write_errors}
+            inserted = [slot for i, slot in enumerate(new_slots) if i not in failed]
+        created = len(inserted)
+        await cache_invalidator.publish(db, PUBLIC_SLOTS)
+        await record_slots_created(db, inserted)
+    
+    return TimeSlotBulkResult(created=created, skipped=len(requested) - created)
+
 @api_router.get("/slots", response_model=List[TimeSlotResponse])
 async def get_time_slots(
+    request: Request,
+    response: Response,
     available_only: bool = False,
     limit: int = 50,  # Optimisation: limite par défaut
     skip: int = 0,    # Optimisation: pagination
+    cursor: Optional[str] = None,  # Keyset pagination (prioritaire sur skip)
     db = Depends(get_db)
 ):
-    """Get time slots with pagination and filtering."""
-    query = {}
+    """Get time slots with pagination and filtering.
+    
+    The next page cursor is returned in the X-Next-Cursor header.
+    Public listings (available_only=true) are served from the response cache.
+    """
+    if available_only:
+        cache_key = response_cache.key(PUBLIC_SLOTS, request)
+        entry = response_cache.get(cache_key)
+        if entry:
+            return cached_response(request, entry)
+    
+    query = keyset_filter(cursor, SLOT_SORT)
     if available_only:
         query["is_available"] = True
     
     # Optimisation: utiliser projection et limit
-    cursor = db.time_slots.find(query).sort("date", 1).skip(skip).limit(limit)
-    slots = await cursor.to_list(length=limit)
+    slots_cursor = db.time_slots.find(query).sort(list(SLOT_SORT))
+    if not cursor:
+        slots_cursor = slots_cursor.skip(skip)
+    slots = await slots_cursor.limit(limit).to_list(length=limit)
+    set_next_cursor(response, slots, limit, SLOT_SORT)
     
-    return [TimeSlotResponse(**slot) for slot in slots]
+    body = slot_list_serializer.dump(slots)
+    if available_only:
+        entry = response_cache.store(cache_key, body, next_cursor_headers(response))
+        return cached_response(request, entry)
+    return json_response(body, next_cursor_headers(response))
+
+# Plage maximale du calendrier de disponibilités
+MAX_AVAILABILITY_DAYS = 366
+
+@api_router.get("/slots/availability", response_model=AvailabilitySummary)
+async def get_slot_availability(
+    request: Request,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    day: Optional[date] = None,  # Drill-down: créneaux disponibles de ce jour
+    db = Depends(get_db)
+):
+    """Per-day counts of available slots for a date range (default: next 30 days)."""
+    cache_key = response_cache.key(PUBLIC_SLOTS, request)
+    entry = response_cache.get(cache_key)
+    if entry:
+        return cached_response(request, entry)
+    
+    start_date = start_date or datetime.utcnow().date()
+    end_date = end_date or start_date + timedelta(days=30)
+    if end_date < start_date:
+        raise HTTPException(status_code=400, detail="end_date must be after start_date")
+    if (end_date - start_date).days > MAX_AVAILABILITY_DAYS:
+        raise HTTPException(status_code=400, detail=f"Date range too large (max {MAX_AVAILABILITY_DAYS} days)")
+    
+    # Single $group over the (is_available, date) index
+    pipeline = [
+        {
+            "$match": {
+                "is_available": True,
+                "date": {
+                    "$gte": datetime.combine(start_date, datetime.min.time()),
+                    "$lt": datetime.combine(end_date + timedelta(days=1), datetime.min.time())
+                }
+            }
+        },
+        {"$group": {"_id": {"$dateToString": {"format": "%Y-%m-%d", "date": "$date"}}, "available": {"$sum": 1}}},
+        {"$sort": {"_id": 1}}
+    ]
+    days = await db.time_slots.aggregate(pipeline).to_list(length=None)
+    summary = AvailabilitySummary(
+        days=[DayAvailability(date=entry["_id"], available=entry["available"]) for entry in days]
+    )
+    
+    if day:
+        slots = await db.time_slots.find({
+            "is_available": True,
+            "date": {
+                "$gte": datetime.combine(day, datetime.min.time()),
+                "$lt": datetime.combine(day + timedelta(days=1), datetime.min.time())
+            }
+        }).sort("start_time", 1).to_list(length=None)
+        summary.slots = [TimeSlotResponse(**slot) for slot in slots]
+    
+    entry = response_cache.store(cache_key, summary.model_dump_json().encode())
+    return cached_response(request, entry)
 
 @api_router.delete("/slots/{slot_id}")
 async def delete_time_slot(
@@ -262,6 +384,8 @@ async def delete_time_slot(
     
     # Delete the slot
     await db.time_slots.delete_one({"id": slot_id})
+    await cache_invalidator.publish(db, PUBLIC_SLOTS)
+    await record_slot_deleted(db, slot)
     
     return {"message": "Time slot deleted successfully"}
 
@@ -272,43 +396,55 @@ async def delete_time_slot(
 @api_router.post("/appointments", response_model=AppointmentResponse)
 async def create_appointment(
     appointment_data: AppointmentCreate,
-    background_tasks: BackgroundTasks,
     current_user: User = Depends(get_current_active_user_with_db),
     db = Depends(get_db)
 ):
     """Create a new appointment."""
     
-    # Check if slot exists and is still available
-    slot = await db.time_slots.find_one({"id": appointment_data.slot_id, "is_available": True})
+    # Reserve the slot atomically - only one booking can flip is_available
+    slot = await db.time_slots.find_one_and_update(
+        {"id": appointment_data.slot_id, "is_available": True},
+        {"$set": {"is_available": False}},
+        return_document=ReturnDocument.AFTER
+    )
     if not slot:
+        bookings_total.labels("slot_unavailable").inc()
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Time slot not available"
         )
+    await cache_invalidator.publish(db, PUBLIC_SLOTS)
     
-    # Create appointment
+    # Create appointment with client and slot snapshots, so reads need no joins
     appointment = Appointment(
         user_id=current_user.id,
         slot_id=appointment_data.slot_id,
         service_name=appointment_data.service_name,
         service_price=appointment_data.service_price,
-        notes=appointment_data.notes
+        notes=appointment_data.notes,
+        **user_snapshot(current_user.model_dump()),
+        slot_info=slot_snapshot(slot)
     )
     
     appointment_dict = appointment.model_dump()
-    await db.appointments.insert_one(appointment_dict)
-    
-    # Mark slot as unavailable
-    await db.time_slots.update_one(
-        {"id": appointment_data.slot_id},
-        {"$set": {"is_available": False}}
-    )
+    try:
+        await db.appointments.insert_one(appointment_dict)
+    except Exception:
+        # Release the reservation if the appointment could not be stored
+        await db.time_slots.update_one(
+            {"id": appointment_data.slot_id},
+            {"$set": {"is_available": True}}
+        )
+        await cache_invalidator.publish(db, PUBLIC_SLOTS)
+        bookings_total.labels("failed").inc()
+        raise
+    bookings_total.labels("created").inc()
+    await record_booking(db, appointment_dict, slot)
     
-    # Schedule email notification in background (non-blocking)
+    # Queue email notification in the outbox (sent by the email worker)
     try:
-        # Get admin emails
-        admin_users = await db.users.find({"role": "admin"}).to_list(10)
-        admin_emails = [admin["email"] for admin in admin_users]
+        # Get admin emails (cached registry)
+        admin_emails = await admin_recipients.recipients("appointment_notification")
         
         if admin_emails:
             user_name = f"{current_user.first_name} {current_user.last_name}"
@@ -316,144 +452,55 @@ async def create_appointment(
             appointment_date = slot_obj.date.strftime("%d/%m/%Y")
             appointment_time = slot_obj.start_time
             
-            # Add background task - this returns immediately without waiting for email
-            background_tasks.add_task(
-                send_appointment_notification_background,
-                admin_emails=admin_emails,
-                user_name=user_name,
-                user_email=current_user.email,
-                service_name=appointment_data.service_name,
-                appointment_date=appointment_date,
-                appointment_time=appointment_time
-            )
-            logging.info(f"Email notification scheduled for appointment: {appointment.id}")
+            await enqueue_emails(db, "appointment_notification", [
+                {
+                    "admin_email": admin_email,
+                    "user_name": user_name,
+                    "user_email": current_user.email,
+                    "service_name": appointment_data.service_name,
+                    "appointment_date": appointment_date,
+                    "appointment_time": appointment_time
+                }
+                for admin_email in admin_emails
+            ])
+            logging.info(f"Email notification queued for appointment: {appointment.id}")
     except Exception as e:
         logging.warning(f"Failed to schedule email notification: {str(e)}")
         # Continue - email failure shouldn't block appointment creation
     
-    # Return appointment with populated fields (user_name, user_email, slot_info)
-    pipeline = [
-        {"$match": {"id": appointment.id}},
-        {
-            "$lookup": {
-                "from": "users",
-                "localField": "user_id",
-                "foreignField": "id",
-                "as": "user_info"
-            }
-        },
-        {
-            "$lookup": {
-                "from": "time_slots",
-                "localField": "slot_id",
-                "foreignField": "id",
-                "as": "slot_info"
-            }
-        },
-        {
-            "$addFields": {
-                "user_name": {
-                    "$concat": [
-                        {"$arrayElemAt": ["$user_info.first_name", 0]},
-                        " ",
-                        {"$arrayElemAt": ["$user_info.last_name", 0]}
-                    ]
-                },
-                "user_email": {"$arrayElemAt": ["$user_info.email", 0]},
-                "slot_info": {"$arrayElemAt": ["$slot_info", 0]}
-            }
-        },
-        {
-            "$project": {
-                "user_info": 0  # Remove user_info array
-            }
-        }
-    ]
-    
-    created_appointment_list = await db.appointments.aggregate(pipeline).to_list(length=1)
-    if not created_appointment_list:
-        # Fallback to basic response if aggregation fails
-        return AppointmentResponse(**appointment_dict)
-    
-    return AppointmentResponse(**created_appointment_list[0])
+    return AppointmentResponse(**appointment_dict)
 
 @api_router.get("/appointments", response_model=List[AppointmentResponse])
 async def get_appointments(
+    response: Response,
     current_user: User = Depends(get_current_active_user_with_db),
     limit: int = 50,  # Optimisation: pagination
     skip: int = 0,
+    cursor: Optional[str] = None,  # Keyset pagination (prioritaire sur skip)
     db = Depends(get_db)
 ):
-    """Get appointments for current user or all appointments if admin."""
+    """Get appointments for current user or all appointments if admin.
+    
+    The next page cursor is returned in the X-Next-Cursor header.
+    """
+    match = keyset_filter(cursor, APPOINTMENT_SORT)
+    page = [
+        {"$sort": dict(APPOINTMENT_SORT)},
+        *([] if cursor else [{"$skip": skip}]),
+        {"$limit": limit}
+    ]
     
     if current_user.role == UserRole.ADMIN:
         # Admin can see all appointments with user info - Optimisation: agregation pipeline
-        pipeline = [
-            {"$sort": {"created_at": -1}},
-            {"$skip": skip},
-            {"$limit": limit},
-            {
-                "$lookup": {
-                    "from": "users",
-                    "localField": "user_id",
-                    "foreignField": "id",
-                    "as": "user_info"
-                }
-            },
-            {
-                "$lookup": {
-                    "from": "time_slots",
-                    "localField": "slot_id",
-                    "foreignField": "id",
-                    "as": "slot_info"
-                }
-            },
-            {
-                "$addFields": {
-                    "user_name": {
-                        "$concat": [
-                            {"$arrayElemAt": ["$user_info.first_name", 0]},
-                            " ",
-                            {"$arrayElemAt": ["$user_info.last_name", 0]}
-                        ]
-                    },
-                    "user_email": {"$arrayElemAt": ["$user_info.email", 0]},
-                    "slot_info": {"$arrayElemAt": ["$slot_info", 0]}
-                }
-            },
-            {
-                "$project": {
-                    "user_info": 0  # Remove user_info array
-                }
-            }
-        ]
-        
-        appointments = await db.appointments.aggregate(pipeline).to_list(length=limit)
+        pipeline = appointment_pipeline(match, page)
     else:
         # Regular user can only see their own appointments - with slot info
-        pipeline = [
-            {"$match": {"user_id": current_user.id}},
-            {"$sort": {"created_at": -1}},
-            {"$skip": skip},
-            {"$limit": limit},
-            {
-                "$lookup": {
-                    "from": "time_slots",
-                    "localField": "slot_id",
-                    "foreignField": "id",
-                    "as": "slot_info"
-                }
-            },
-            {
-                "$addFields": {
-                    "slot_info": {"$arrayElemAt": ["$slot_info", 0]}
-                }
-            }
-        ]
-        
-        appointments = await db.appointments.aggregate(pipeline).to_list(length=limit)
+        pipeline = appointment_pipeline({"user_id": current_user.id, **match}, page, with_user=False)
     
-    return [AppointmentResponse(**appointment) for appointment in appointments]
+    appointments = await db.appointments.aggregate(pipeline).to_list(length=limit)
+    
+    set_next_cursor(response, appointments, limit, APPOINTMENT_SORT)
+    return json_response(appointment_list_serializer.dump(appointments), next_cursor_headers(response))
 
 @api_router.put("/appointments/{appointment_id}/status", response_model=AppointmentResponse)
 async def update_appointment_status(
@@ -464,11 +511,6 @@ async def update_appointment_status(
 ):
     """Update appointment status (Admin only)."""
     
-    # Check if appointment exists
-    appointment = await db.appointments.find_one({"id": appointment_id})
-    if not appointment:
-        raise HTTPException(status_code=404, detail="Appointment not found")
-    
     # Update appointment - preserve original client notes if no admin notes provided
     update_fields = {
         "status": appointment_update.status, 
@@ -476,88 +518,64 @@ async def update_appointment_status(
     }
     
     # Only update notes if admin provides new notes, otherwise preserve existing ones
-    if appointment_update.notes is not None and appointment_update.notes.strip():
-        # If admin provides notes, append them to existing client notes
-        existing_notes = appointment.get("notes", "")
-        if existing_notes:
-            update_fields["notes"] = f"{existing_notes}\n\n--- Notes Admin ---\n{appointment_update.notes}"
-        else:
-            update_fields["notes"] = appointment_update.notes
-    # If no admin notes provided, keep existing client notes unchanged
+    admin_notes = appointment_update.notes
+    if admin_notes is not None and admin_notes.strip():
+        # If admin provides notes, append them to existing client notes (computed server-side
+        # so concurrent moderations never overwrite each other's notes)
+        update = [{"$set": {
+            **update_fields,
+            "notes": {"$cond": [
+                {"$gt": [{"$ifNull": ["$notes", ""]}, ""]},
+                {"$concat": ["$notes", "\n\n--- Notes Admin ---\n", {"$literal": admin_notes}]},
+                {"$literal": admin_notes}
+            ]}
+        }}]
+    else:
+        # If no admin notes provided, keep existing client notes unchanged
+        update = {"$set": update_fields}
     
-    await db.appointments.update_one(
+    # The previous version gives the exact status transition, even when two admins
+    # moderate the same appointment concurrently
+    appointment = await db.appointments.find_one_and_update(
         {"id": appointment_id},
-        {"$set": update_fields}
+        update,
+        return_document=ReturnDocument.BEFORE
     )
+    if not appointment:
+        raise HTTPException(status_code=404, detail="Appointment not found")
+    await record_appointment_status(db, appointment, appointment_update.status)
+    
+    if isinstance(update, list):
+        existing_notes = appointment.get("notes", "")
+        update_fields["notes"] = (
+            f"{existing_notes}\n\n--- Notes Admin ---\n{admin_notes}" if existing_notes else admin_notes
+        )
     
     # Send confirmation email to client if status is confirmed
     if appointment_update.status == AppointmentStatus.CONFIRMED:
         try:
-            # Get user and slot info
-            user = await db.users.find_one({"id": appointment["user_id"]})
-            slot = await db.time_slots.find_one({"id": appointment["slot_id"]})
+            # Client and slot from the snapshots embedded in the appointment
+            slot = appointment.get("slot_info")
             
-            if user and slot:
-                user_name = f"{user['first_name']} {user['last_name']}"
-                slot_obj = TimeSlot(**slot)
-                appointment_date = slot_obj.date.strftime("%d/%m/%Y")
-                appointment_time = slot_obj.start_time
+            if appointment.get("user_email") and slot:
+                appointment_date = slot["date"].strftime("%d/%m/%Y")
+                appointment_time = slot["start_time"]
                 
-                await email_service.send_appointment_confirmation_to_client(
-                    client_email=user["email"],
-                    client_name=user_name,
+                await enqueue_email(
+                    db,
+                    "appointment_confirmation",
+                    client_email=appointment["user_email"],
+                    client_name=appointment.get("user_name") or "",
                     service_name=appointment.get("service_name", "Service"),
                     appointment_date=appointment_date,
                     appointment_time=appointment_time,
                     service_price=appointment.get("service_price", 0)
                 )
         except Exception as e:
-            logger.warning(f"Failed to send confirmation email to client: {str(e)}")
+            logger.warning(f"Failed to queue confirmation email to client: {str(e)}")
     
-    # Return the updated appointment with populated fields (user_name, user_email, slot_info)
-    pipeline = [
-        {"$match": {"id": appointment_id}},
-        {
-            "$lookup": {
-                "from": "users",
-                "localField": "user_id",
-                "foreignField": "id",
-                "as": "user_info"
-            }
-        },
-        {
-            "$lookup": {
-                "from": "time_slots",
-                "localField": "slot_id",
-                "foreignField": "id",
-                "as": "slot_info"
-            }
-        },
-        {
-            "$addFields": {
-                "user_name": {
-                    "$concat": [
-                        {"$arrayElemAt": ["$user_info.first_name", 0]},
-                        " ",
-                        {"$arrayElemAt": ["$user_info.last_name", 0]}
-                    ]
-                },
-                "user_email": {"$arrayElemAt": ["$user_info.email", 0]},
-                "slot_info": {"$arrayElemAt": ["$slot_info", 0]}
-            }
-        },
-        {
-            "$project": {
-                "user_info": 0  # Remove user_info array
-            }
-        }
-    ]
-    
-    updated_appointment_list = await db.appointments.aggregate(pipeline).to_list(length=1)
-    if not updated_appointment_list:
-        raise HTTPException(status_code=404, detail="Updated appointment not found")
-    
-    return AppointmentResponse(**updated_appointment_list[0])
+    # The stored document already carries user_name, user_email and slot_info
+    return AppointmentResponse(**{**appointment, **update_fields})
 
 @api_router.delete("/appointments/{appointment_id}")
 async def delete_appointment(
@@ -590,78 +608,62 @@ async def delete_appointment(
         if hours_passed < 1:
             raise HTTPException(status_code=403, detail="You can only delete appointments that are at least 1 hour old")
     
+    # Delete appointment - the deleted version is what leaves the statistics
+    deleted = await db.appointments.find_one_and_delete({"id": appointment_id}, projection={"_id": 0})
+    if not deleted:
+        raise HTTPException(status_code=404, detail="Appointment not found")
+    await record_appointment_deleted(db, deleted)
+    
     # For admin users or eligible client deletions, make the slot available again only if it's not already taken
-    if appointment["status"] in ["confirmed", "pending"]:
-        await db.time_slots.update_one(
-            {"id": appointment["slot_id"]},
-            {"$set": {"is_available": True}}
+    if deleted["status"] in ["confirmed", "pending"]:
+        released_slot = await db.time_slots.find_one_and_update(
+            {"id": deleted["slot_id"], "is_available": False},
+            {"$set": {"is_available": True}},
+            projection={"_id": 0, "date": 1}
         )
-    
-    # Delete appointment
-    await db.appointments.delete_one({"id": appointment_id})
+        await cache_invalidator.publish(db, PUBLIC_SLOTS)
+        if released_slot:
+            await record_slot_released(db, released_slot["date"])
     
     return {"message": "Appointment deleted successfully"}
+
 @api_router.put("/appointments/{appointment_id}/cancel")
 async def cancel_appointment(
     appointment_id: str,
-    background_tasks: BackgroundTasks,
     current_user: User = Depends(get_current_admin_user_with_db),
     db = Depends(get_db)
 ):
     """Cancel an appointment and notify client by email (Admin only)."""
     
-    # Get appointment with user details using aggregation
-    pipeline = [
-        {"$match": {"id": appointment_id}},
-        {
-            "$lookup": {
-                "from": "users",
-                "localField": "user_id",
-                "foreignField": "id",
-                "as": "user_info"
-            }
-        },
-        {
-            "$lookup": {
-                "from": "time_slots",
-                "localField": "slot_id",
-                "foreignField": "id",
-                "as": "slot_info"
-            }
-        },
-        {
-            "$addFields": {
-                "user_info": {"$arrayElemAt": ["$user_info", 0]},
-                "slot_info": {"$arrayElemAt": ["$slot_info", 0]}
-            }
-        }
-    ]
-    
-    appointment_data = await db.appointments.aggregate(pipeline).to_list(length=1)
-    if not appointment_data:
-        raise HTTPException(status_code=404, detail="Appointment not found")
-    
-    appointment = appointment_data[0]
-    
-    # Update appointment status to cancelled
-    await db.appointments.update_one(
+    # Cancel - the previous version (with its client and slot snapshots) gives the exact
+    # status transition, even when two admins act on the same appointment concurrently
+    appointment = await db.appointments.find_one_and_update(
         {"id": appointment_id},
-        {"$set": {"status": "cancelled", "updated_at": datetime.utcnow()}}
+        {"$set": {"status": "cancelled", "updated_at": datetime.utcnow()}},
+        projection={"_id": 0},
+        return_document=ReturnDocument.BEFORE
     )
+    if not appointment:
+        raise HTTPException(status_code=404, detail="Appointment not found")
+    await record_appointment_status(db, appointment, "cancelled")
     
-    # Make the slot available again
-    await db.time_slots.update_one(
-        {"id": appointment["slot_id"]},
-        {"$set": {"is_available": True}}
-    )
+    # Make the slot available again, if this appointment was still holding it
+    if appointment["status"] in ["confirmed", "pending"]:
+        released_slot = await db.time_slots.find_one_and_update(
+            {"id": appointment["slot_id"], "is_available": False},
+            {"$set": {"is_available": True}},
+            projection={"_id": 0, "date": 1}
+        )
+        await cache_invalidator.publish(db, PUBLIC_SLOTS)
+        if released_slot:
+            await record_slot_released(db, released_slot["date"])
     
     # Send cancellation email to client
-    if appointment.get("user_info") and appointment.get("slot_info"):
-        user_info = appointment["user_info"]
+    if appointment.get("user_email") and appointment.get("slot_info"):
         slot_info = appointment["slot_info"]
         
-        client_name = f"{user_info.get('first_name', '')} {user_info.get('last_name', '')}".strip()
-        client_email = user_info.get("email")
+        client_name = (appointment.get("user_name") or "").strip()
+        client_email = appointment.get("user_email")
         service_name = appointment.get("service_name", "Service")
         service_price = appointment.get("service_price", 0)
         
@@ -669,9 +671,12 @@ async def cancel_appointment(
         appointment_date = "Date non spécifiée"
         appointment_time = "Heure non spécifiée"
         
-        if slot_info.get("date"):
+        slot_date = slot_info.get("date")
+        if isinstance(slot_date, datetime):
+            appointment_date = slot_date.strftime("%d/%m/%Y")
+        elif slot_date:
             try:
-                date_obj = datetime.fromisoformat(slot_info["date"].replace('Z', '+00:00'))
+                date_obj = datetime.fromisoformat(slot_date.replace('Z', '+00:00'))
                 appointment_date = date_obj.strftime("%d/%m/%Y")
             except:
                 pass
@@ -679,10 +684,11 @@ async def cancel_appointment(
         if slot_info.get("start_time"):
             appointment_time = slot_info["start_time"]
         
-        # Send email in background (non-blocking for better performance)
+        # Queue cancellation email in the outbox
         if client_email:
-            background_tasks.add_task(
-                send_appointment_cancellation_background,
+            await enqueue_email(
+                db,
+                "appointment_cancellation",
                 client_email=client_email,
                 client_name=client_name,
                 service_name=service_name,
@@ -690,7 +696,7 @@ async def cancel_appointment(
                 appointment_time=appointment_time,
                 service_price=service_price
             )
-            logging.info(f"Cancellation email scheduled for: {client_email}")
+            logging.info(f"Cancellation email queued for: {client_email}")
         else:
             logging.warning("No client email found for cancellation notification")
     
@@ -703,7 +709,6 @@ async def cancel_appointment(
 @api_router.post("/reviews", response_model=ReviewResponse)
 async def create_review(
     review_data: ReviewCreate,
-    background_tasks: BackgroundTasks,
     current_user: User = Depends(get_current_active_user_with_db),
     db = Depends(get_db)
 ):
@@ -718,41 +723,58 @@ async def create_review(
     review_dict = review.model_dump()
     await db.reviews.insert_one(review_dict)
     
-    # Send notification to admin in background (non-blocking for better performance)
+    # Queue notification to admins in the outbox
     try:
-        admin_users = await db.users.find({"role": "admin"}).to_list(10)
-        admin_emails = [admin["email"] for admin in admin_users]
+        admin_emails = await admin_recipients.recipients("review_notification")
         
         if admin_emails:
             user_name = f"{current_user.first_name} {current_user.last_name}"
-            background_tasks.add_task(
-                send_review_notification_background,
-                admin_emails=admin_emails,
-                user_name=user_name,
-                rating=review_data.rating,
-                comment=review_data.comment
-            )
-            logging.info(f"Review notification scheduled for: {user_name} - {review_data.rating} stars")
+            await enqueue_emails(db, "review_notification", [
+                {
+                    "admin_email": admin_email,
+                    "user_name": user_name,
+                    "rating": review_data.rating,
+                    "comment": review_data.comment
+                }
+                for admin_email in admin_emails
+            ])
+            logging.info(f"Review notification queued for: {user_name} - {review_data.rating} stars")
     except Exception as e:
-        logger.warning(f"Failed to schedule review notification: {str(e)}")
+        logger.warning(f"Failed to queue review notification: {str(e)}")
     
     return ReviewResponse(**review_dict)
 
 @api_router.get("/reviews", response_model=List[ReviewResponse])
 async def get_reviews(
+    request: Request,
+    response: Response,
     approved_only: bool = False,
     limit: int = 50,  # Optimisation: pagination
     skip: int = 0,
+    cursor: Optional[str] = None,  # Keyset pagination (prioritaire sur skip)
     db = Depends(get_db),
     current_user: Optional[User] = Depends(get_current_user_with_db_optional)
 ):
-    """Get reviews. If approved_only=true, no authentication required."""
+    """Get reviews. If approved_only=true, no authentication required.
+    
+    The next page cursor is returned in the X-Next-Cursor header.
+    Public listings (approved_only=true) are served from the response cache.
+    """
+    match = keyset_filter(cursor, REVIEW_SORT)
     
     if approved_only:
+        cache_key = response_cache.key(PUBLIC_REVIEWS, request)
+        entry = response_cache.get(cache_key)
+        if entry:
+            return cached_response(request, entry)
+        
         # Public endpoint - optimized with compound index
-        reviews = await db.reviews.find(
-            {"status": "approved"}
-        ).sort("created_at", -1).skip(skip).limit(limit).to_list(length=limit)
+        reviews_cursor = db.reviews.find(
+            {"status": "approved", **match}
+        ).sort(list(REVIEW_SORT))
+        if not cursor:
+            reviews_cursor = reviews_cursor.skip(skip)
+        reviews = await reviews_cursor.limit(limit).to_list(length=limit)
     else:
         # Admin endpoint - need authentication
         if not current_user or current_user.role != UserRole.ADMIN:
@@ -763,38 +785,31 @@ async def get_reviews(
         
         # Optimised aggregation pipeline for admin reviews
         pipeline = [
-            {"$sort": {"created_at": -1}},
-            {"$skip": skip},
+            {"$match": match},
+            {"$sort": dict(REVIEW_SORT)},
+            *([] if cursor else [{"$skip": skip}]),
             {"$limit": limit},
-            {
-                "$lookup": {
-                    "from": "users",
-                    "localField": "user_id",
-                    "foreignField": "id",
-                    "as": "user_info"
-                }
-            },
-            {
-                "$addFields": {
-                    "user_name": {
-                        "$concat": [
-                            {"$arrayElemAt": ["$user_info.first_name", 0]},
-                            " ",
-                            {"$arrayElemAt": ["$user_info.last_name", 0]}
-                        ]
-                    }
-                }
-            },
-            {
-                "$project": {
-                    "user_info": 0
-                }
-            }
+            *REVIEW_ENRICHMENT
         ]
         
         reviews = await db.reviews.aggregate(pipeline).to_list(length=limit)
     
-    return [ReviewResponse(**review) for review in reviews]
+    set_next_cursor(response, reviews, limit, REVIEW_SORT)
+    body = review_list_serializer.dump(reviews)
+    if approved_only:
+        entry = response_cache.store(cache_key, body, next_cursor_headers(response))
+        return cached_response(request, entry)
+    return json_response(body, next_cursor_headers(response))
+
+@api_router.get("/reviews/summary", response_model=ReviewSummary)
+async def get_reviews_summary(request: Request, db = Depends(get_db)):
+    """Approved reviews count, average rating and 1-5 histogram (public, cached)."""
+    cache_key = response_cache.key(PUBLIC_REVIEWS, request)
+    entry = response_cache.get(cache_key)
+    if entry is None:
+        summary = ReviewSummary(**await get_review_summary(db))
+        entry = response_cache.store(cache_key, summary.model_dump_json().encode())
+    return cached_response(request, entry)
 
 @api_router.put("/reviews/{review_id}", response_model=ReviewResponse)
 async def update_review_status(
@@ -805,24 +820,141 @@ async def update_review_status(
 ):
     """Update review status (Admin only)."""
     
-    # Check if review exists
-    review = await db.reviews.find_one({"id": review_id})
-    if not review:
-        raise HTTPException(status_code=404, detail="Review not found")
-    
-    # Update review
-    await db.reviews.update_one(
+    # Update review - the previous version gives the exact status transition,
+    # even when two admins moderate the same review concurrently
+    update_fields = {"status": review_update.status, "updated_at": datetime.utcnow()}
+    review = await db.reviews.find_one_and_update(
         {"id": review_id},
-        {"$set": {"status": review_update.status, "updated_at": datetime.utcnow()}}
+        {"$set": update_fields},
+        return_document=ReturnDocument.BEFORE
     )
+    if not review:
+        raise HTTPException(status_code=404, detail="Review not found")
+    await apply_review_transition(db, review, review_update.status)
+    await cache_invalidator.publish(db, PUBLIC_REVIEWS)
+    await record_review_status(db, review, review_update.status)
     
-    updated_review = await db.reviews.find_one({"id": review_id})
-    return ReviewResponse(**updated_review)
+    return ReviewResponse(**{**review, **update_fields})
 
 # ==========================================
 # UTILITY ROUTES
 # ==========================================
 
+# Plage maximale des statistiques (un document de rollup par jour)
+MAX_STATS_DAYS = 1830
+
+@api_router.get("/admin/stats", response_model=AdminStats)
+async def get_admin_stats(
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    group_by: StatsGrouping = StatsGrouping.MONTH,
+    current_user: User = Depends(get_current_admin_user_with_db),
+    db = Depends(get_db)
+):
+    """Bookings by status, revenue, average rating and slot occupancy per period (Admin only).
+    
+    Defaults to the last 12 months; read from the daily rollups.
+    """
+    end_date = end_date or datetime.utcnow().date()
+    start_date = start_date or end_date - timedelta(days=365)
+    if end_date < start_date:
+        raise HTTPException(status_code=400, detail="end_date must be after start_date")
+    if (end_date - start_date).days > MAX_STATS_DAYS:
+        raise HTTPException(status_code=400, detail=f"Date range too large (max {MAX_STATS_DAYS} days)")
+    
+    return await get_stats(db, start_date, end_date, group_by.value)
+
+# ==========================================
+# LIVE EVENTS (SSE)
+# ==========================================
+
+@api_router.post("/events/ticket", response_model=EventTicket)
+async def create_event_ticket(
+    current_user: User = Depends(get_current_active_user_with_db),
+    db = Depends(get_db)
+):
+    """Issue a short-lived, single-use ticket for the authenticated event stream."""
+    ticket = await issue_ticket(db, current_user.id, current_user.role == UserRole.ADMIN)
+    return EventTicket(ticket=ticket, expires_in=SSE_TICKET_TTL_SECONDS)
+
+@api_router.get("/events")
+async def live_events(
+    ticket: Optional[str] = None,  # EventSource ne peut pas envoyer d'en-tête Authorization
+    current_user: Optional[User] = Depends(get_current_user_with_db_optional),
+    db = Depends(get_db)
+):
+    """Server-Sent Events: slot changes for everyone, plus appointments and reviews for admins.
+    
+    Authenticated streams are opened with a ticket from POST /api/events/ticket.
+    """
+    if ticket:
+        redeemed = await redeem_ticket(db, ticket)
+        if redeemed is None:
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid or expired event ticket")
+        is_admin = redeemed["is_admin"]
+    else:
+        is_admin = current_user is not None and current_user.is_active and current_user.role == UserRole.ADMIN
+    return StreamingResponse(
+        event_broker.stream(is_admin),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+# ==========================================
+# ADMIN DASHBOARD
+# ==========================================
+
+@api_router.get("/admin/dashboard", response_model=AdminDashboard)
+async def get_admin_dashboard(
+    limit: int = 50,
+    current_user: User = Depends(get_current_admin_user_with_db),
+    db = Depends(get_db)
+):
+    """First page of appointments, slots and reviews plus summary counts (Admin only).
+    
+    Replaces three separate list requests; further pages are fetched from the list
+    endpoints with the returned cursors.
+    """
+    today = datetime.utcnow().date()
+    week_start = datetime.combine(today - timedelta(days=today.weekday()), datetime.min.time())
+    
+    (
+        appointments, slots, reviews,
+        pending_appointments, pending_reviews, free_slots_this_week
+    ) = await asyncio.gather(
+        db.appointments.aggregate(
+            appointment_pipeline(page=[{"$sort": dict(APPOINTMENT_SORT)}, {"$limit": limit}])
+        ).to_list(length=limit),
+        db.time_slots.find().sort(list(SLOT_SORT)).limit(limit).to_list(length=limit),
+        db.reviews.aggregate([
+            {"$sort": dict(REVIEW_SORT)},
+            {"$limit": limit},
+            *REVIEW_ENRICHMENT
+        ]).to_list(length=limit),
+        db.appointments.count_documents({"status": AppointmentStatus.PENDING}),
+        db.reviews.count_documents({"status": ReviewStatus.PENDING}),
+        db.time_slots.count_documents({
+            "is_available": True,
+            "date": {"$gte": week_start, "$lt": week_start + timedelta(days=7)}
+        }),
+    )
+    
+    return json_response(dashboard_serializer.dump({
+        "summary": {
+            "pending_appointments": pending_appointments,
+            "pending_reviews": pending_reviews,
+            "free_slots_this_week": free_slots_this_week,
+        },
+        "appointments": appointments,
+        "slots": slots,
+        "reviews": reviews,
+        "next_cursors": {
+            "appointments": next_cursor(appointments, limit, APPOINTMENT_SORT),
+            "slots": next_cursor(slots, limit, SLOT_SORT),
+            "reviews": next_cursor(reviews, limit, REVIEW_SORT),
+        },
+    }))
+
 @api_router.get("/ping")
 async def health_check():
     """Health check endpoint."""
@@ -838,40 +970,21 @@ async def health_check_head():
 # ==========================================
 
 # Fonctions pour gérer l'état de maintenance en base de données
-async def get_maintenance_from_db():
-    """Récupère l'état de maintenance depuis la base de données."""
-    db = await get_database()
-    maintenance_doc = await db.maintenance.find_one({"_id": "site_maintenance"})
-    
-    if maintenance_doc:
-        return {
-            "is_maintenance": maintenance_doc.get("is_maintenance", False),
-            "message": maintenance_doc.get("message", "Site en maintenance. Veuillez réessayer plus tard."),
-            "enabled_at": maintenance_doc.get("enabled_at"),
-            "enabled_by": maintenance_doc.get("enabled_by")
-        }
-    else:
-        # État par défaut si aucun document n'existe
-        return {
-            "is_maintenance": False,
-            "message": "Site en maintenance. Veuillez réessayer plus tard.",
-            "enabled_at": None,
-            "enabled_by": None
-        }
-
 async def save_maintenance_to_db(maintenance_state):
-    """Sauvegarde l'état de maintenance en base de données."""
+    """Sauvegarde l'état de maintenance en base de données et met à jour le cache de chaque worker."""
     db = await get_database()
     await db.maintenance.update_one(
-        {"_id": "site_maintenance"},
+        {"_id": MAINTENANCE_DOC_ID},
         {"$set": maintenance_state},
         upsert=True
     )
+    maintenance_cache.set(maintenance_state)
+    await cache_invalidator.publish(db, MAINTENANCE)
 
 @api_router.get("/maintenance", response_model=MaintenanceStatus)
 async def get_maintenance_status():
     """Get current maintenance status - public endpoint."""
-    maintenance_state = await get_maintenance_from_db()
+    maintenance_state = maintenance_cache.state
     return MaintenanceStatus(**maintenance_state)
 
 @api_router.post("/maintenance", response_model=MaintenanceStatus)
@@ -918,7 +1031,6 @@ def generate_reset_code():
 @api_router.post("/auth/password-reset/request")
 async def request_password_reset(
     request: PasswordResetRequest,
-    background_tasks: BackgroundTasks,
     db = Depends(get_db)
 ):
     """Request password reset - sends code via email."""
@@ -944,12 +1056,13 @@ async def request_password_reset(
     # Insert new reset code
     await db.password_resets.insert_one(reset_data.model_dump())
     
-    # Send email in background
-    background_tasks.add_task(
-        send_password_reset_email,
-        request.email,
-        reset_code,
-        user.get("first_name", "")
+    # Queue email in the outbox
+    await enqueue_email(
+        db,
+        "password_reset",
+        email=request.email,
+        code=reset_code,
+        first_name=user.get("first_name", "")
     )
     
     return {"message": "Si l'email existe, un code de réinitialisation a été envoyé."}
@@ -984,44 +1097,20 @@ async def confirm_password_reset(
         )
     
     # Hash new password
-    hashed_password = get_password_hash(request.new_password)
+    hashed_password = await get_password_hash_async(request.new_password)
     
     # Update user password
     await db.users.update_one(
         {"email": request.email},
         {"$set": {"password_hash": hashed_password, "updated_at": datetime.utcnow()}}
     )
+    await cache_invalidator.publish(db, USERS, request.email)
     
-    # Mark reset code as used
-    await db.password_resets.update_one(
-        {"id": reset_record["id"]},
-        {"$set": {"used": True}}
-    )
-    
-    # Clean up old reset codes for this email
-    await db.password_resets.delete_many({
-        "email": request.email,
-        "$or": [
-            {"used": True},
-            {"expires_at": {"$lt": datetime.utcnow()}}
-        ]
-    })
+    # Consume the code - expired codes of other users are removed by the TTL index
+    await db.password_resets.delete_many({"email": request.email})
     
     return {"message": "Mot de passe réinitialisé avec succès"}
 
-# Background task for sending password reset email
-async def send_password_reset_email(email: str, code: str, first_name: str):
-    """Send password reset email in background."""
-    try:
-        await email_service.send_password_reset_email(
-            email=email,
-            code=code,
-            first_name=first_name
-        )
-        print(f"Password reset email sent to {email}")
-    except Exception as e:
-        print(f"Failed to send password reset email to {email}: {e}")
-
 # ==========================================
 # MAINTENANCE MIDDLEWARE
 # ==========================================
@@ -1034,12 +1123,12 @@ async def maintenance_middleware(request: Request, call_next):
     """Middleware to handle maintenance mode."""
     try:
         # Skip maintenance check for static health endpoints
-        if request.url.path in ["/", "/health", "/api/ping"]:
+        if request.url.path in ["/", "/health", "/metrics", "/metrics/database", "/api/ping"]:
             response = await call_next(request)
             return response
             
-        # Récupérer l'état de maintenance depuis la BD
-        maintenance_state = await get_maintenance_from_db()
+        # État de maintenance depuis le cache local (aucun accès BD)
+        maintenance_state = maintenance_cache.state
         
         # Always allow these endpoints even during maintenance
         allowed_paths = ["/api/maintenance", "/api/maintenance/emergency-disable", "/api/login", "/api/register", "/api/ping", "/docs", "/openapi.json", "/"]
@@ -1094,6 +1183,21 @@ app.add_middleware(
     expose_headers=["*"]
 )
 
+# Outermost middleware, so latency includes CORS and maintenance handling
+app.add_middleware(PrometheusMiddleware)
+registry.add_collector(cache_collector("user_cache", user_cache.stats))
+registry.add_collector(cache_collector("response_cache", response_cache.stats))
+registry.add_collector(pool_metrics.prometheus_metrics)
+registry.add_collector(gauge_collector(
+    "hennalash_password_hash_queue_depth", "bcrypt hash/verify calls queued or running.", password_hash_queue_depth))
+
+# Per-worker caches, invalidated in every worker through cache_invalidator
+cache_invalidator.register(PUBLIC_SLOTS, lambda key: response_cache.invalidate(PUBLIC_SLOTS))
+cache_invalidator.register(PUBLIC_REVIEWS, lambda key: response_cache.invalidate(PUBLIC_REVIEWS))
+cache_invalidator.register(USERS, lambda email: user_cache.invalidate(email) if email else user_cache.clear())
+cache_invalidator.register(ADMIN_RECIPIENTS, lambda key: admin_recipients.invalidate())
+cache_invalidator.register(MAINTENANCE, maintenance_cache.reload)
+
 # ==========================================
 # ROOT ROUTE for Health Check (Render compatibility)
 # ==========================================
@@ -1126,6 +1230,10 @@ async def health_check():
             "status": "healthy",
             "service": "HennaLash API",
             "database": "connected",
+            "worker_pid": os.getpid(),
+            "password_hash_queue_depth": password_hash_queue_depth(),
+            "user_cache": user_cache.stats(),
+            "response_cache": response_cache.stats(),
             "timestamp": datetime.utcnow().isoformat()
         }
     except Exception as e:
@@ -1137,6 +1245,16 @@ async def health_check():
             "timestamp": datetime.utcnow().isoformat()
         }
 
+@app.get("/metrics", include_in_schema=False)
+async def prometheus_metrics():
+    """Prometheus scrape endpoint for this worker process."""
+    return Response(content=registry.render(), media_type=METRICS_CONTENT_TYPE)
+
+@app.get("/metrics/database")
+async def database_pool_metrics():
+    """Motor connection pool metrics of this worker process."""
+    return {"worker_pid": os.getpid(), "pool": pool_metrics.snapshot()}
+
 # Mount the API router
 app.include_router(api_router)
 
@@ -1147,17 +1265,32 @@ logger = logging.getLogger(__name__)
 # Startup event to create indexes
 @app.on_event("startup")
 async def startup_event():
-    """Create database indexes on startup."""
-    await create_indexes()
-    logger.info("Database indexes created successfully")
+    """Load maintenance state on startup (indexes are applied by `python -m migrations`)."""
+    PrometheusMiddleware.preallocate(app.routes)
+    await maintenance_cache.reload()
+    await cache_invalidator.start()
+    try:
+        await admin_recipients.refresh()
+    except PyMongoError as e:
+        # Loaded on first use instead - the API must boot without the database
+        logger.warning(f"Initial admin recipients load failed: {e}")
 
 # Shutdown event
 @app.on_event("shutdown")
 async def shutdown_event():
-    """Close database connection on shutdown."""
+    """Close database connection on shutdown (in-flight requests have already drained)."""
+    await cache_invalidator.stop()
+    await event_broker.stop()
+    password_hash_executor.shutdown(wait=True)
     await close_db_connection()
     logger.info("Database connection closed")
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8001)
\ No newline at end of file
+    uvicorn.run(
+        "server:app",
+        host="0.0.0.0",
+        port=int(os.environ.get("PORT", "8001")),
+        workers=int(os.environ.get("WEB_CONCURRENCY", "1")),
+        timeout_graceful_shutdown=int(os.environ.get("GRACEFUL_TIMEOUT", "30")),
+    )
\ No newline at end of file
@@ -0,0 +1,173 @@
+"""Appointment snapshot reconciler.
+
+Usage (from the backend directory):
+    python -m snapshots
+"""
+import asyncio
+import logging
+import os
+import signal
+
+from pymongo import UpdateOne
+
+from change_watcher import ChangeStreamWatcher
+from database import close_db_connection
+from pipelines import LOOKUP_SLOT, LOOKUP_USER, SLOT_FIELDS, USER_NAME
+
+logger = logging.getLogger(__name__)
+
+# Balayage complet quand les change streams ne sont pas disponibles
+SNAPSHOT_RECONCILE_INTERVAL = float(os.environ.get("SNAPSHOT_RECONCILE_INTERVAL", "900"))
+SNAPSHOT_BATCH_SIZE = int(os.environ.get("SNAPSHOT_BATCH_SIZE", "500"))
+
+# Jeton de reprise du change stream `users`, conservé entre les redémarrages
+SNAPSHOT_SYNC_COLLECTION = "snapshot_sync"
+SNAPSHOT_SYNC_ID = "users"
+
+SLOT_SNAPSHOT_FIELDS = [field for field, included in SLOT_FIELDS.items() if included]
+USER_SNAPSHOT_FIELDS = ("first_name", "last_name", "email")
+
+
+def user_snapshot(user: dict) -> dict:
+    """Client fields embedded in appointments; kept in sync by the reconciler."""
+    return {
+        "user_name": f"{user.get('first_name', '')} {user.get('last_name', '')}",
+        "user_email": user.get("email"),
+    }
+
+
+def slot_snapshot(slot: dict) -> dict:
+    """Slot as it was when booked; never updated afterwards."""
+    return {field: slot.get(field) for field in SLOT_SNAPSHOT_FIELDS}
+
+
+async def propagate_user(db, user: dict) -> int:
+    """Rewrite the client snapshot of every appointment of `user`."""
+    result = await db.appointments.update_many(
+        {"user_id": user["id"]},
+        {"$set": user_snapshot(user)}
+    )
+    return result.modified_count
+
+
+async def backfill_snapshots(db) -> int:
+    """Fix appointments whose client snapshot is stale or whose slot snapshot is missing.
+
+    Joins every appointment once; used by the reconciler when it has no resume token
+    to continue from, as the polling fallback and by the migration that introduced snapshots.
+    """
+    pipeline = [
+        # The slot lookup writes to `slot_info`, so keep the stored snapshot aside first
+        {"$addFields": {"slot_info_snapshot": "$slot_info"}},
+        LOOKUP_USER,
+        LOOKUP_SLOT,
+        {"$project": {
+            "_id": 0,
+            "id": 1,
+            "user_name": 1,
+            "user_email": 1,
+            "has_user": {"$gt": [{"$size": "$user_info"}, 0]},
+            "current_user_name": USER_NAME,
+            "current_user_email": {"$arrayElemAt": ["$user_info.email", 0]},
+            "current_slot": {"$arrayElemAt": ["$slot_info", 0]},
+            "has_slot_snapshot": {"$gt": [{"$ifNull": ["$slot_info_snapshot", None]}, None]},
+        }},
+    ]
+
+    fixed = 0
+    batch = []
+    async for row in db.appointments.aggregate(pipeline):
+        update = {}
+        if row["has_user"] and (row.get("user_name") != row["current_user_name"]
+                                or row.get("user_email") != row["current_user_email"]):
+            update.update({"user_name": row["current_user_name"], "user_email": row["current_user_email"]})
+        if not row["has_slot_snapshot"] and row.get("current_slot"):
+            update["slot_info"] = row["current_slot"]
+        if update:
+            batch.append(UpdateOne({"id": row["id"]}, {"$set": update}))
+        if len(batch) >= SNAPSHOT_BATCH_SIZE:
+            fixed += (await db.appointments.bulk_write(batch, ordered=False)).modified_count
+            batch = []
+    if batch:
+        fixed += (await db.appointments.bulk_write(batch, ordered=False)).modified_count
+    return fixed
+
+
+class SnapshotReconciler(ChangeStreamWatcher):
+    """Propagates client profile changes to the appointment snapshots.
+
+    Watches `users` for name/email changes and stores the stream's resume token in
+    `snapshot_sync`, so a restart continues where it stopped. The full backfill only
+    runs when there is no usable token. Without change streams it falls back to a
+    full backfill every `interval` seconds.
+    """
+
+    description = "Users change stream"
+    resumable = True
+
+    def __init__(self, interval: float = SNAPSHOT_RECONCILE_INTERVAL):
+        super().__init__(poll_interval=interval)
+
+    def open_stream(self, db, resume_after):
+        changed_fields = [
+            {f"updateDescription.updatedFields.{field}": {"$exists": True}} for field in USER_SNAPSHOT_FIELDS
+        ]
+        pipeline = [{"$match": {"$or": [{"operationType": "replace"}, *changed_fields]}}]
+        return db.users.watch(pipeline, full_document="updateLookup", resume_after=resume_after)
+
+    async def on_open(self, db, stream, resumed: bool):
+        if not resumed:
+            # Rien pour reprendre : rattraper les changements manqués une fois
+            await self.poll(db)
+            await self.save_resume_token(db, stream.resume_token)
+
+    async def on_change(self, db, change: dict):
+        user = change.get("fullDocument")
+        if user:
+            await propagate_user(db, user)
+
+    async def poll(self, db):
+        fixed = await backfill_snapshots(db)
+        if fixed:
+            logger.info(f"Snapshot backfill updated {fixed} appointments")
+
+    async def load_resume_token(self, db):
+        state = await db[SNAPSHOT_SYNC_COLLECTION].find_one({"_id": SNAPSHOT_SYNC_ID})
+        return (state or {}).get("resume_token")
+
+    async def save_resume_token(self, db, resume_token):
+        await db[SNAPSHOT_SYNC_COLLECTION].update_one(
+            {"_id": SNAPSHOT_SYNC_ID},
+            {"$set": {"resume_token": resume_token}},
+            upsert=True
+        )
+
+
+# Global reconciler, run by its own worker (python -m snapshots)
+snapshot_reconciler = SnapshotReconciler()
+
+
+async def run_reconciler():
+    """Keep the snapshots in sync until SIGINT/SIGTERM."""
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+
+    await snapshot_reconciler.start()
+    logger.info("Snapshot reconciler started")
+    try:
+        await stop.wait()
+    finally:
+        await snapshot_reconciler.stop()
+        await close_db_connection()
+        logger.info("Snapshot reconciler stopped")
+
+
+def main():
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(run_reconciler())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+import asyncio
+import inspect
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+import database  # noqa: E402
+
+# Real mongod for the concurrency tests when set, e.g. mongodb://localhost:27017
+MONGO_TEST_URL = os.environ.get("MONGO_TEST_URL")
+
+
+def _yielding(method):
+    async def wrapper(*args, **kwargs):
+        await asyncio.sleep(0)
+        return await method(*args, **kwargs)
+    return wrapper
+
+
+@pytest.fixture
+def mongo_client(monkeypatch):
+    """Motor-compatible client installed as this process's client, on a throwaway database.
+
+    The mock runs every operation synchronously, so its collection methods are made to
+    yield to the event loop first; otherwise concurrent coroutines never interleave.
+    """
+    if MONGO_TEST_URL:
+        from motor.motor_asyncio import AsyncIOMotorClient
+        client = AsyncIOMotorClient(MONGO_TEST_URL)
+    else:
+        from mongomock_motor import AsyncMongoMockClient, AsyncMongoMockCollection
+        for name, method in inspect.getmembers(AsyncMongoMockCollection, inspect.iscoroutinefunction):
+            if not name.startswith("_"):
+                monkeypatch.setattr(AsyncMongoMockCollection, name, _yielding(method))
+        client = AsyncMongoMockClient()
+    previous = database._client, database._client_pid, database.DB_NAME
+    database._client, database._client_pid = client, os.getpid()
+    database.DB_NAME = f"hennalash_test_{os.getpid()}"
+    yield client
+    asyncio.run(client.drop_database(database.DB_NAME))
+    database._client, database._client_pid, database.DB_NAME = previous
@@ -0,0 +1,43 @@
+import asyncio
+from datetime import datetime, timedelta
+
+from fastapi import HTTPException
+
+import server
+from models import AppointmentCreate, User
+
+CONCURRENT_BOOKINGS = 300
+
+
+async def _book_one_slot_concurrently():
+    db = await server.get_database()
+    slot = server.build_time_slot(datetime.utcnow() + timedelta(days=1), "10:00", "admin").model_dump()
+    await db.time_slots.insert_one(slot)
+    clients = [
+        User(email=f"client{i}@example.com", password_hash="x", first_name="Client", last_name=str(i))
+        for i in range(CONCURRENT_BOOKINGS)
+    ]
+
+    async def book(user: User):
+        return await server.create_appointment(
+            AppointmentCreate(slot_id=slot["id"], service_name="HennaLash", service_price=15.0),
+            current_user=user,
+            db=db
+        )
+
+    results = await asyncio.gather(*(book(user) for user in clients), return_exceptions=True)
+    stored_slot = await db.time_slots.find_one({"id": slot["id"]})
+    appointments = await db.appointments.count_documents({"slot_id": slot["id"]})
+    return results, stored_slot, appointments
+
+
+def test_concurrent_bookings_reserve_the_slot_once(mongo_client):
+    results, stored_slot, appointments = asyncio.run(_book_one_slot_concurrently())
+
+    successes = [result for result in results if not isinstance(result, Exception)]
+    failures = [result for result in results if isinstance(result, Exception)]
+    assert len(successes) == 1
+    assert len(failures) == CONCURRENT_BOOKINGS - 1
+    assert all(isinstance(error, HTTPException) and error.status_code == 400 for error in failures)
+    assert appointments == 1
+    assert stored_slot["is_available"] is False
@@ -35,18 +35,23 @@ const AdminDashboard = () => {
     fetchData();
   }, [isAuthenticated, user, navigate]);
 
+  // Nouvelles réservations et nouveaux avis en direct
+  useEffect(() => {
+    if (!isAuthenticated || user?.role !== 'admin') return undefined;
+    return apiService.subscribeToEvents(
+      () => fetchData(),
+      ['appointment.created', 'appointment.updated', 'appointment.deleted', 'review.created', 'review.updated']
+    );
+  }, [isAuthenticated, user]);
+
   const fetchData = async () => {
     setLoading(true);
     try {
-      const [appointmentsData, slotsData, reviewsData] = await Promise.all([
-        apiService.getAppointments(),
-        apiService.getSlots(),
-        apiService.getAllReviews()
-      ]);
+      const dashboard = await apiService.getAdminDashboard();
       
-      setAppointments(appointmentsData || []);
-      setSlots(slotsData || []);
-      setReviews(reviewsData || []);
+      setAppointments(dashboard.appointments || []);
+      setSlots(dashboard.slots || []);
+      setReviews(dashboard.reviews || []);
     } catch (error) {
       console.error('Error fetching data:', error);
       toast({
@@ -50,6 +50,22 @@ const ClientDashboard = () => {
     loadDashboardData();
   }, [loadDashboardData]);
 
+  // Disponibilités en direct : un créneau réservé disparaît sans rechargement
+  useEffect(() => {
+    if (!isAuthenticated) return undefined;
+    return apiService.subscribeToEvents((type, slot) => {
+      if (type === 'slot.deleted') {
+        loadDashboardData();
+        return;
+      }
+      setAvailableSlots((current) => {
+        const others = current.filter((s) => s.id !== slot.id);
+        if (!slot.is_available) return others;
+        return [...others, slot].sort((a, b) => `${a.date}${a.start_time}`.localeCompare(`${b.date}${b.start_time}`));
+      });
+    }, ['slot.created', 'slot.updated', 'slot.deleted']);
+  }, [isAuthenticated, loadDashboardData]);
+
   // Redirect if not authenticated or is admin - APRÈS tous les hooks
   if (!isAuthenticated) {
     return <Navigate to="/connexion" replace />;
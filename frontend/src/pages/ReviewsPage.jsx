@@ -12,11 +12,14 @@ import axios from 'axios';
 const CACHE_DURATION = 5 * 60 * 1000; // 5 minutes
 let reviewsCache = {
   data: null,
+  summary: null,
   timestamp: null
 };
 
 const ReviewsPage = () => {
   const [reviews, setReviews] = useState([]);
+  // Résumé calculé côté serveur sur tous les avis approuvés (pas seulement la page chargée)
+  const [summary, setSummary] = useState({ count: 0, average: null, histogram: {} });
   const [loading, setLoading] = useState(true);
   const [selectedService, setSelectedService] = useState('Tous');
   
@@ -34,20 +37,26 @@ const ReviewsPage = () => {
       const now = Date.now();
       if (reviewsCache.data && reviewsCache.timestamp && (now - reviewsCache.timestamp) < CACHE_DURATION) {
         setReviews(reviewsCache.data);
+        setSummary(reviewsCache.summary);
         setLoading(false);
         return;
       }
       
-      const response = await axios.get(`${API_BASE_URL}/api/reviews?approved_only=true`);
+      const [response, summaryResponse] = await Promise.all([
+        axios.get(`${API_BASE_URL}/api/reviews?approved_only=true`),
+        axios.get(`${API_BASE_URL}/api/reviews/summary`)
+      ]);
       const reviewsData = response.data;
       
       // Mettre en cache
       reviewsCache = {
         data: reviewsData,
+        summary: summaryResponse.data,
         timestamp: now
       };
       
       setReviews(reviewsData);
+      setSummary(summaryResponse.data);
     } catch (error) {
       console.error('Error fetching reviews:', error);
       setReviews([]);
@@ -107,18 +116,18 @@ const ReviewsPage = () => {
             </p>
             
             {/* Rating */}
-            {reviews.length > 0 && (
+            {summary.count > 0 && (
               <div className="flex items-center justify-center gap-2 mb-2">
                 <span className="text-6xl font-bold text-orange-600">
-                  {(reviews.reduce((acc, review) => acc + review.rating, 0) / reviews.length).toFixed(1)}
+                  {summary.average.toFixed(1)}
                 </span>
                 <div className="flex">
-                  {renderStars(Math.round(reviews.reduce((acc, review) => acc + review.rating, 0) / reviews.length))}
+                  {renderStars(Math.round(summary.average))}
                 </div>
               </div>
             )}
             <p className="text-sm text-gray-500">
-              Basé sur {reviews.length} avis client(s)
+              Basé sur {summary.count} avis client(s)
             </p>
           </div>
 
@@ -174,11 +183,11 @@ const ReviewsPage = () => {
           )}
 
           {/* Stats Section */}
-          {reviews.length > 0 && (
+          {summary.count > 0 && (
             <div className="grid md:grid-cols-3 gap-8 mb-16 text-center">
               <div className="group bg-white rounded-xl shadow-lg p-8 hover:shadow-xl transition-all duration-300">
                 <div className="text-5xl md:text-6xl font-bold text-orange-600 mb-2 group-hover:scale-110 transition-transform duration-300">
-                  {reviews.length}
+                  {summary.count}
                 </div>
                 <p className="text-lg text-gray-600 font-medium">
                   Avis approuvés
@@ -186,7 +195,7 @@ const ReviewsPage = () => {
               </div>
               <div className="group bg-white rounded-xl shadow-lg p-8 hover:shadow-xl transition-all duration-300">
                 <div className="text-5xl md:text-6xl font-bold text-orange-600 mb-2 group-hover:scale-110 transition-transform duration-300">
-                  {(reviews.reduce((acc, review) => acc + review.rating, 0) / reviews.length).toFixed(1)}
+                  {summary.average.toFixed(1)}
                 </div>
                 <p className="text-lg text-gray-600 font-medium">
                   Note moyenne
@@ -194,7 +203,7 @@ const ReviewsPage = () => {
               </div>
               <div className="group bg-white rounded-xl shadow-lg p-8 hover:shadow-xl transition-all duration-300">
                 <div className="text-5xl md:text-6xl font-bold text-orange-600 mb-2 group-hover:scale-110 transition-transform duration-300">
-                  {reviews.filter(r => r.rating === 5).length}
+                  {summary.histogram['5'] || 0}
                 </div>
                 <p className="text-lg text-gray-600 font-medium">
                   Avis 5 étoiles
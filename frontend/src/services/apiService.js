@@ -1,6 +1,8 @@
 import axios from 'axios';
 
 const API_BASE_URL = process.env.REACT_APP_BACKEND_URL || 'https://hennalash.onrender.com';
+// Délai avant de rouvrir le flux SSE (le serveur le ferme après SSE_MAX_STREAM_SECONDS)
+const SSE_RECONNECT_DELAY_MS = 5000;
 
 // Instance axios optimisée
 const apiClient = axios.create({
@@ -47,6 +49,11 @@ export const apiService = {
     return response.data;
   },
 
+  getSlotAvailability: async (params = {}) => {
+    const response = await apiClient.get('/api/slots/availability', { params });
+    return response.data;
+  },
+
   // Appointments avec optimisation
   getAppointments: async () => {
     const response = await apiClient.get('/api/appointments');
@@ -78,6 +85,12 @@ export const apiService = {
     return response.data;
   },
 
+  // Nombre d'avis, note moyenne et histogramme 1-5 (document matérialisé)
+  getReviewSummary: async () => {
+    const response = await apiClient.get('/api/reviews/summary');
+    return response.data;
+  },
+
   getAllReviews: async () => {
     const response = await apiClient.get('/api/reviews');
     return response.data;
@@ -99,6 +112,11 @@ export const apiService = {
     return response.data;
   },
 
+  createSlotsBulk: async (schedule) => {
+    const response = await apiClient.post('/api/slots/bulk', schedule);
+    return response.data;
+  },
+
   deleteSlot: async (slotId) => {
     await apiClient.delete(`/api/slots/${slotId}`);
     return true;
@@ -110,19 +128,23 @@ export const apiService = {
     return response.status === 200;
   },
 
+  // Tableau de bord admin en une seule requête (listes + compteurs)
+  getAdminDashboard: async (limit = 50) => {
+    const response = await apiClient.get('/api/admin/dashboard', { params: { limit } });
+    return response.data;
+  },
+
+  // Statistiques admin (rollups journaliers) - group_by: day | week | month
+  getAdminStats: async (params = {}) => {
+    const response = await apiClient.get('/api/admin/stats', { params });
+    return response.data;
+  },
+
   // Batch operations pour réduire les requêtes
   getDashboardData: async (userRole = 'client') => {
     if (userRole === 'admin') {
-      const [appointments, slots, reviews] = await Promise.all([
-        apiClient.get('/api/appointments'),
-        apiClient.get('/api/slots'),
-        apiClient.get('/api/reviews')
-      ]);
-      return {
-        appointments: appointments.data,
-        slots: slots.data,
-        reviews: reviews.data
-      };
+      const { appointments, slots, reviews } = await apiService.getAdminDashboard();
+      return { appointments, slots, reviews };
     } else {
       const [appointments, slots] = await Promise.all([
         apiClient.get('/api/appointments'),
@@ -135,6 +157,44 @@ export const apiService = {
     }
   },
 
+  // Événements en direct (SSE) - retourne une fonction de désabonnement
+  // Le jeton d'accès ne passe jamais dans l'URL : un ticket à usage unique est demandé
+  // à chaque (re)connexion, d'où la reconnexion gérée ici plutôt que par EventSource
+  subscribeToEvents: (onEvent, eventTypes) => {
+    if (typeof EventSource === 'undefined') return () => {};
+    let source = null;
+    let retryTimer = null;
+    let closed = false;
+
+    const connect = async () => {
+      let query = '';
+      if (localStorage.getItem('auth_token')) {
+        try {
+          const response = await apiClient.post('/api/events/ticket');
+          query = `?ticket=${encodeURIComponent(response.data.ticket)}`;
+        } catch (error) {
+          // Sans ticket : flux public (créneaux uniquement)
+        }
+      }
+      if (closed) return;
+      source = new EventSource(`${API_BASE_URL}/api/events${query}`);
+      eventTypes.forEach((type) => {
+        source.addEventListener(type, (event) => onEvent(type, JSON.parse(event.data)));
+      });
+      source.onerror = () => {
+        source.close();
+        if (!closed) retryTimer = setTimeout(connect, SSE_RECONNECT_DELAY_MS);
+      };
+    };
+
+    connect();
+    return () => {
+      closed = true;
+      clearTimeout(retryTimer);
+      if (source) source.close();
+    };
+  },
+
   // Password Reset
   requestPasswordReset: async (email) => {
     const response = await apiClient.post('/api/auth/password-reset/request', { email });